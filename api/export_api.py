@@ -1,30 +1,78 @@
 """Export endpoints -- bulk zip download and single-session md/json."""
 
-import io
-import json
+import functools
+import logging
+import multiprocessing
 import os
+import re
+import threading
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 
-from flask import Blueprint, current_app, jsonify, request, send_file
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
 
-from utils.session_path import get_claude_projects_dir, list_projects, list_sessions
-from utils.jsonl_parser import parse_session
+from utils import fastjson
+from utils.session_path import list_projects, list_sessions, safe_join_cached, stat_file
+from utils.jsonl_parser import (
+    parse_session,
+    parse_session_cached,
+    quick_session_title,
+    quick_session_title_cached,
+)
 from utils.session_stats import compute_stats
 from utils.md_exporter import session_to_markdown
 from utils.json_exporter import session_to_json
-from utils.exclusion_rules import build_searchable_text, is_excluded_by_rules
+from utils.exclusion_rules import ExclusionMatcher, build_searchable_text, iter_searchable_parts
 
 export_bp = Blueprint("export", __name__)
 
+_logger = logging.getLogger(__name__)
+
 _STATE_FILE = os.path.join(os.path.expanduser("~"), ".claude-code-chat-browser", "export_state.json")
 
+# Serializes the read-merge-write in _write_state between concurrent exports.
+_state_lock = threading.Lock()
+
+# Bulk exports with fewer sessions than this render in-process; pool
+# start-up and pickling would cost more than they save.
+_IN_PROCESS_MAX_TASKS = 16
+
+# One worker pool for the life of the server, created on first big export.
+_export_pool = None
+_export_pool_lock = threading.Lock()
+
+
+def _get_export_pool() -> ProcessPoolExecutor:
+    """The shared pool for bulk-export rendering. Workers come from a
+    forkserver where there is one: forking this multi-threaded server
+    directly (quick-info threads, request threads) can deadlock a child on
+    a lock some other thread held at fork time."""
+    global _export_pool
+    with _export_pool_lock:
+        if _export_pool is None:
+            ctx = None
+            if "forkserver" in multiprocessing.get_all_start_methods():
+                ctx = multiprocessing.get_context("forkserver")
+            _export_pool = ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=ctx)
+        return _export_pool
+
+
+def _discard_export_pool(pool: ProcessPoolExecutor):
+    """Drop *pool* after a worker died so the next export starts a new one."""
+    global _export_pool
+    with _export_pool_lock:
+        if _export_pool is pool:
+            _export_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
 
 def _read_state() -> dict:
     if os.path.exists(_STATE_FILE):
         try:
-            with open(_STATE_FILE) as f:
-                return json.load(f)
+            with open(_STATE_FILE, "rb") as f:
+                return fastjson.loads(f.read())
         except Exception:
             pass
     return {}
@@ -32,22 +80,27 @@ def _read_state() -> dict:
 
 def _write_state(sessions_map: dict, count: int):
     os.makedirs(os.path.dirname(_STATE_FILE), exist_ok=True)
-    state = _read_state()
-    state["lastExportTime"] = datetime.now().isoformat()
-    state["exportedCount"] = count
-    state.setdefault("sessions", {}).update(sessions_map)
-    with open(_STATE_FILE, "w") as f:
-        json.dump(state, f, indent=2)
-
-
-def _session_text_for_exclusion(session: dict) -> str:
-    """Extract a plain-text snippet from session messages for exclusion matching."""
-    parts = []
+    with _state_lock:
+        state = _read_state()
+        state["lastExportTime"] = datetime.now().isoformat()
+        state["exportedCount"] = count
+        state.setdefault("sessions", {}).update(sessions_map)
+        # Write beside the real file and swap it in, so a crash mid-write
+        # never leaves a truncated state file behind.
+        tmp = _STATE_FILE + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(fastjson.dumps(state))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, _STATE_FILE)
+
+
+def _session_texts_for_exclusion(session: dict):
+    """Yield the message texts of *session* for exclusion matching."""
     for msg in session.get("messages", []):
         text = msg.get("text") or ""
         if isinstance(text, str) and text.strip():
-            parts.append(text)
-    return "\n\n".join(parts)
+            yield text
 
 
 @export_bp.route("/api/export/state")
@@ -59,146 +112,241 @@ def get_export_state():
     })
 
 
+_NON_SLUG_RUN = re.compile(r"[^a-z0-9]+")
+
+
 def _slugify(text: str) -> str:
-    import re
-    text = text.lower()
-    text = re.sub(r"[^a-z0-9]+", "-", text)
-    return text.strip("-")
+    return _NON_SLUG_RUN.sub("-", text.lower()).strip("-")
+
+
+class _ZipStreamSink:
+    """Write-only file object for streaming a ZipFile out in pieces.
+
+    It has no tell()/seek(), so zipfile switches to data descriptors and
+    never needs to go back and patch a local header; whatever has been
+    written so far can be drained and sent to the client.
+    """
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _export_one(task: tuple, matcher: ExclusionMatcher | None, cached: bool = False) -> tuple | None:
+    """Parse, filter and render one session for the bulk zip.
+
+    Runs inside a worker process, so it lives at module scope and only
+    receives picklable arguments.  Returns ``(rel_path, md_bytes,
+    manifest_entry)``, or None when the session is skipped or fails.
+    *cached* goes through the parse caches; only the in-process path sets
+    it, since a long-lived pool worker would fill its own caches with
+    whole sessions that later chunks, landing on other workers, never hit.
+    """
+    project, sess_info = task
+    title_of = quick_session_title_cached if cached else quick_session_title
+    parse = parse_session_cached if cached else parse_session
+    sid = sess_info["id"]
+    project_name = project["display_name"]
+    try:
+        # Untitled sessions are never exported, so find the title cheaply
+        # before paying for a full parse.
+        title = title_of(sess_info["path"])
+        if title == "Untitled Session":
+            return None
+
+        if matcher:
+            # The project name and title are a prefix of the full searchable
+            # text, so a hit here is final without parsing the session.
+            if matcher.matches(build_searchable_text(
+                project_name=project_name,
+                session_title=title,
+            )):
+                return None
+
+        session = parse(sess_info["path"])
+        if session["title"] == "Untitled Session":
+            return None
+
+        if matcher:
+            meta = session["metadata"]
+            if matcher.matches_chunks(iter_searchable_parts(
+                project_name=project_name,
+                session_title=session["title"],
+                model_names=meta.get("models_used"),
+                content_parts=_session_texts_for_exclusion(session),
+            )):
+                return None
+
+        stats = compute_stats(session)
+        md = session_to_markdown(session, stats)
+        title_slug = _slugify(session["title"]) or "session"
+        short_id = sid[:8]
+        proj_slug = project["slug"]
+        ts = session["metadata"].get("first_timestamp", "")
+        ts_file = ts[:19].replace(":", "-") if ts else "0000-00-00T00-00-00"
+        rel_path = f"{proj_slug}/{ts_file}__{title_slug}__{short_id}.md"
+        manifest_entry = {
+            "session_id": sid,
+            "title": session["title"],
+            "project": project["name"],
+            "tokens": session["metadata"]["total_input_tokens"]
+            + session["metadata"]["total_output_tokens"],
+            "tool_calls": session["metadata"]["total_tool_calls"],
+            "cost_estimate_usd": stats.get("cost_estimate_usd"),
+        }
+        return rel_path, md.encode("utf-8"), manifest_entry
+    except Exception as e:
+        _logger.warning("Failed to export %s: %s", sid[:10], e)
+        return None
 
 
 @export_bp.route("/api/export", methods=["POST"])
 def bulk_export():
     body = request.get_json(silent=True) or {}
     since = "last" if body.get("since") == "last" else "all"
-
-    base = current_app.config.get("CLAUDE_PROJECTS_DIR") or get_claude_projects_dir()
+    # ?fast=1 skips deflate for clients that compress in transit anyway.
+    # Otherwise level 3 is ~2x cheaper than the default 6 and only a few
+    # percent larger on markdown.
+    if request.args.get("fast") == "1":
+        compression, compresslevel = zipfile.ZIP_STORED, None
+    else:
+        compression, compresslevel = zipfile.ZIP_DEFLATED, 3
+
+    base = current_app.config["CLAUDE_PROJECTS_DIR"]
     projects = list_projects(base)
-    rules = current_app.config.get("EXCLUSION_RULES") or []
+    matcher = current_app.config.get("EXCLUSION_MATCHER")
 
     state = _read_state()
     last_export_sessions: dict = state.get("sessions", {}) if since == "last" else {}
 
-    buf = io.BytesIO()
-    count = 0
-    manifest = []
-    new_sessions_map: dict = {}
-    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
-        for project in projects:
-            sessions = list_sessions(project["path"])
-            for sess_info in sessions:
-                sid = sess_info["id"]
-                try:
-                    if since == "last":
-                        prev_mtime = last_export_sessions.get(sid, 0)
-                        curr_mtime = sess_info.get("modified", 0)
-                        if curr_mtime and curr_mtime <= prev_mtime:
-                            continue
-
-                    session = parse_session(sess_info["path"])
-                    if session["title"] == "Untitled Session":
+    # Flatten to (project, session) pairs up front; the mtime check is cheap
+    # so it stays here rather than shipping skipped sessions to a worker.
+    # Per-project values are resolved once and shared by all its sessions.
+    tasks = []
+    for project in projects:
+        project_meta = {
+            "name": project["name"],
+            "display_name": project.get("display_name") or project["name"],
+            "slug": _slugify(project["name"]),
+        }
+        for sess_info in list_sessions(project["path"]):
+            if since == "last":
+                prev_mtime = last_export_sessions.get(sess_info["id"], 0)
+                curr_mtime = sess_info.get("modified", 0)
+                if curr_mtime and curr_mtime <= prev_mtime:
+                    continue
+            tasks.append((project_meta, sess_info))
+
+    def generate():
+        sink = _ZipStreamSink()
+        count = 0
+        manifest = []
+        new_sessions_map: dict = {}
+        # Parsing and rendering are CPU-bound, so big exports fan them out
+        # across processes; zipfile isn't thread-safe, so this generator stays
+        # the only writer and hands each finished entry to the client right away.
+        pool = _get_export_pool() if len(tasks) >= _IN_PROCESS_MAX_TASKS else None
+        worker = functools.partial(_export_one, matcher=matcher, cached=pool is None)
+        results = None
+        try:
+            if pool is None:
+                results = map(worker, tasks)
+            else:
+                results = pool.map(worker, tasks, chunksize=8)
+            with zipfile.ZipFile(sink, "w", compression, compresslevel=compresslevel) as zf:
+                writestr = zf.writestr
+                add_to_manifest = manifest.append
+                for (_, sess_info), result in zip(tasks, results):
+                    if result is None:
                         continue
-
-                    if rules:
-                        meta = session["metadata"]
-                        searchable = build_searchable_text(
-                            project_name=project.get("display_name") or project["name"],
-                            session_title=session["title"],
-                            model_names=list(meta.get("models_used") or []),
-                            content_snippet=_session_text_for_exclusion(session),
-                        )
-                        if is_excluded_by_rules(rules, searchable):
-                            continue
-
-                    stats = compute_stats(session)
-                    md = session_to_markdown(session, stats)
-                    title_slug = _slugify(session["title"]) or "session"
-                    short_id = sid[:8]
-                    proj_slug = _slugify(project["name"])
-                    ts = session["metadata"].get("first_timestamp", "")
-                    ts_file = ts[:19].replace(":", "-") if ts else "0000-00-00T00-00-00"
-                    rel_path = f"{proj_slug}/{ts_file}__{title_slug}__{short_id}.md"
-                    zf.writestr(rel_path, md)
-                    manifest.append({
-                        "session_id": sid,
-                        "title": session["title"],
-                        "project": project["name"],
-                        "tokens": session["metadata"]["total_input_tokens"]
-                        + session["metadata"]["total_output_tokens"],
-                        "tool_calls": session["metadata"]["total_tool_calls"],
-                        "cost_estimate_usd": stats.get("cost_estimate_usd"),
-                    })
-                    new_sessions_map[sid] = sess_info.get("modified", 0)
+                    rel_path, md_bytes, manifest_entry = result
+                    writestr(rel_path, md_bytes)
+                    add_to_manifest(manifest_entry)
+                    new_sessions_map[sess_info["id"]] = sess_info.get("modified", 0)
                     count += 1
-                except Exception as e:
-                    current_app.logger.warning("Failed to export %s: %s", sid[:10], e)
-                    continue
-        if manifest:
-            manifest_str = "\n".join(json.dumps(e, default=str) for e in manifest)
-            zf.writestr("manifest.jsonl", manifest_str)
-
-    if count > 0:
-        _write_state(new_sessions_map, count)
+                    yield sink.drain()
+                if manifest:
+                    zf.writestr(
+                        "manifest.jsonl",
+                        b"\n".join(fastjson.dumps(e, default=str) for e in manifest),
+                    )
+        except BrokenProcessPool:
+            _discard_export_pool(pool)
+            raise
+        finally:
+            # The pool is shared: closing the pool's result iterator cancels
+            # whatever an aborted download still had queued.
+            close = getattr(results, "close", None)
+            if close is not None:
+                close()
+        # Closing the ZipFile wrote the central directory.
+        yield sink.drain()
+
+        # Only record the export once the whole archive has gone out; an
+        # aborted download leaves the since-last state untouched.
+        if count > 0:
+            _write_state(new_sessions_map, count)
 
-    buf.seek(0)
     date_tag = datetime.now().strftime("%Y-%m-%d")
     suffix = "-since-last" if since == "last" else ""
-    return send_file(
-        buf,
+    return Response(
+        stream_with_context(generate()),
         mimetype="application/zip",
-        as_attachment=True,
-        download_name=f"claude-code-export{suffix}-{date_tag}.zip",
+        headers={
+            "Content-Disposition":
+                f"attachment; filename=claude-code-export{suffix}-{date_tag}.zip",
+        },
     )
 
 
 @export_bp.route("/api/export/session/<path:project_name>/<session_id>")
 def export_session(project_name, session_id):
-    import os
-    from utils.session_path import safe_join
-    base = current_app.config.get("CLAUDE_PROJECTS_DIR") or get_claude_projects_dir()
+    base = current_app.config["CLAUDE_PROJECTS_DIR"]
     try:
-        filepath = safe_join(base, project_name, f"{session_id}.jsonl")
+        filepath = safe_join_cached(base, project_name, f"{session_id}.jsonl")
     except ValueError:
         return jsonify({"error": "Invalid path"}), 400
 
-    if not os.path.isfile(filepath):
+    st = stat_file(filepath)
+    if st is None:
         return jsonify({"error": "Session not found"}), 404
 
     fmt = request.args.get("format", "md")
-    session = parse_session(filepath)
-    rules = current_app.config.get("EXCLUSION_RULES") or []
-    if rules:
+    session = parse_session_cached(filepath, st)
+    matcher = current_app.config.get("EXCLUSION_MATCHER")
+    if matcher:
         meta = session["metadata"]
-        text_parts = [msg.get("text") or "" for msg in session.get("messages", []) if msg.get("text")]
-        searchable = build_searchable_text(
+        if matcher.matches_chunks(iter_searchable_parts(
             project_name=project_name,
             session_title=session["title"],
-            model_names=list(meta.get("models_used") or []),
-            content_snippet="\n\n".join(text_parts),
-        )
-        if is_excluded_by_rules(rules, searchable):
+            model_names=meta.get("models_used"),
+            content_parts=(msg.get("text") for msg in session.get("messages", [])),
+        )):
             return jsonify({"error": "Session not found"}), 404
     stats = compute_stats(session)
     title_slug = _slugify(session["title"]) or "session"
 
+    # Hand the encoded body straight to the Response rather than wrapping it
+    # in a BytesIO for send_file(); Content-Length comes from the bytes.
     if fmt == "json":
-        content = session_to_json(session, stats)
-        buf = io.BytesIO(content.encode("utf-8"))
-        buf.seek(0)
-        return send_file(
-            buf,
-            mimetype="application/json",
-            as_attachment=True,
-            download_name=f"{title_slug}.json",
-        )
-
-    md = session_to_markdown(session, stats)
-    buf = io.BytesIO(md.encode("utf-8"))
-    buf.seek(0)
-    return send_file(
-        buf,
-        mimetype="text/markdown",
-        as_attachment=True,
-        download_name=f"{title_slug}.md",
+        body = session_to_json(session, stats).encode("utf-8")
+        mimetype, ext = "application/json", "json"
+    else:
+        body = session_to_markdown(session, stats).encode("utf-8")
+        mimetype, ext = "text/markdown", "md"
+    return Response(
+        body,
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename={title_slug}.{ext}"},
     )
-
-
@@ -1,39 +1,99 @@
 """Project listing endpoints."""
 
-import traceback
+import functools
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 
 from flask import Blueprint, current_app, jsonify
 
-from utils.session_path import get_claude_projects_dir, list_projects, list_sessions, safe_join
-from utils.exclusion_rules import build_searchable_text, is_excluded_by_rules
+from utils.session_path import list_projects, list_sessions, safe_join
+from utils.exclusion_rules import ExclusionMatcher, iter_searchable_parts
+from utils.jsonl_parser import parse_session, quick_session_info_cached, quick_session_title
 
 projects_bp = Blueprint("projects", __name__)
 
+_logger = logging.getLogger(__name__)
+
+# Shared across requests so the landing page doesn't pay thread start-up.
+_QUICK_INFO_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix="quick-info")
+
+
+def _quick_info_or_none(path: str) -> dict | None:
+    try:
+        return quick_session_info_cached(path)
+    except Exception:
+        return None
+
+
+def _listing_summary(path: str, project_name: str, matcher: ExclusionMatcher | None) -> dict | None:
+    """The fields the session listing shows for the session at *path*, or
+    None when it is untitled or excluded. Memoized on the file's (mtime,
+    size) like parse_session_cached(), but only this small summary is kept,
+    so the cache can cover every session of a big project."""
+    st = os.stat(path)
+    return _listing_summary_keyed(path, st.st_mtime_ns, st.st_size, project_name, matcher)
+
+
+@functools.lru_cache(maxsize=4096)
+def _listing_summary_keyed(
+    path: str, mtime_ns: int, size: int, project_name: str, matcher: ExclusionMatcher | None
+) -> dict | None:
+    # Skip untitled sessions (no real conversation) without a full parse
+    title = quick_session_title(path)
+    if title == "Untitled Session":
+        return None
+    # Project name and title lead the searchable text, so a hit on
+    # them alone excludes the session before it's parsed.
+    if matcher and matcher.matches_chunks((project_name, title)):
+        return None
+    parsed = parse_session(path)
+    meta = parsed["metadata"]
+    if matcher:
+        searchable = iter_searchable_parts(
+            project_name=project_name,
+            session_title=parsed["title"],
+            model_names=meta.get("models_used"),
+            content_parts=(msg.get("text") for msg in parsed.get("messages", [])),
+        )
+        if matcher.matches_chunks(searchable):
+            return None
+    return {
+        "title": parsed["title"],
+        "models": meta["models_used"],
+        "tokens": meta["total_input_tokens"] + meta["total_output_tokens"],
+        "tool_calls": meta["total_tool_calls"],
+        "first_timestamp": meta["first_timestamp"],
+        "last_timestamp": meta["last_timestamp"],
+    }
+
 
 @projects_bp.route("/api/projects")
 def get_projects():
-    base = current_app.config.get("CLAUDE_PROJECTS_DIR") or get_claude_projects_dir()
+    base = current_app.config["CLAUDE_PROJECTS_DIR"]
     projects = list_projects(base)
 
     # Enrich each project with accurate titled-session count and latest timestamp
     # so the landing page matches what the workspace page shows.
-    # Uses quick_session_info() which peeks at files without full parsing.
-    from utils.jsonl_parser import quick_session_info
-    for project in projects:
-        sessions = list_sessions(project["path"])
+    # Uses quick_session_info() which peeks at files without full parsing; the
+    # peeks are I/O-bound, so they run on a shared thread pool.
+    sessions_by_project = [list_sessions(p["path"]) for p in projects]
+    paths = [s["path"] for sessions in sessions_by_project for s in sessions]
+    infos = iter(_QUICK_INFO_POOL.map(_quick_info_or_none, paths))
+    for project, sessions in zip(projects, sessions_by_project):
         titled_count = 0
         latest_ts = None
-        for s in sessions:
-            try:
-                info = quick_session_info(s["path"])
-                if info["title"] == "Untitled Session":
-                    continue
-                titled_count += 1
-                ts = info.get("last_timestamp") or info.get("first_timestamp")
-                if ts and (latest_ts is None or ts > latest_ts):
-                    latest_ts = ts
-            except Exception:
+        for _ in sessions:
+            info = next(infos)
+            if info is None:
                 titled_count += 1
+                continue
+            if info["title"] == "Untitled Session":
+                continue
+            titled_count += 1
+            ts = info.get("last_timestamp") or info.get("first_timestamp")
+            if ts and (latest_ts is None or ts > latest_ts):
+                latest_ts = ts
         project["session_count"] = titled_count
         if latest_ts:
             project["last_modified"] = latest_ts
@@ -43,43 +103,21 @@ def get_projects():
 
 @projects_bp.route("/api/projects/<path:project_name>/sessions")
 def get_project_sessions(project_name):
-    base = current_app.config.get("CLAUDE_PROJECTS_DIR") or get_claude_projects_dir()
+    base = current_app.config["CLAUDE_PROJECTS_DIR"]
     try:
         project_dir = safe_join(base, project_name)
     except ValueError:
         return jsonify([]), 400
     sessions = list_sessions(project_dir)
     # Add summary preview for each session
-    from utils.jsonl_parser import parse_session
-    rules = current_app.config.get("EXCLUSION_RULES") or []
+    matcher = current_app.config.get("EXCLUSION_MATCHER")
     result = []
     for s in sessions:
         try:
-            parsed = parse_session(s["path"])
-            meta = parsed["metadata"]
-            # Skip untitled sessions (no real conversation)
-            if parsed["title"] == "Untitled Session":
-                continue
-            if rules:
-                text_parts = [msg.get("text") or "" for msg in parsed.get("messages", []) if msg.get("text")]
-                searchable = build_searchable_text(
-                    project_name=project_name,
-                    session_title=parsed["title"],
-                    model_names=list(meta.get("models_used") or []),
-                    content_snippet="\n\n".join(text_parts),
-                )
-                if is_excluded_by_rules(rules, searchable):
-                    continue
-            result.append({
-                **s,
-                "title": parsed["title"],
-                "models": meta["models_used"],
-                "tokens": meta["total_input_tokens"] + meta["total_output_tokens"],
-                "tool_calls": meta["total_tool_calls"],
-                "first_timestamp": meta["first_timestamp"],
-                "last_timestamp": meta["last_timestamp"],
-            })
+            summary = _listing_summary(s["path"], project_name, matcher)
+            if summary is not None:
+                result.append({**s, **summary})
         except Exception as e:
-            print(f"[ERROR] Failed to parse {s['id']}: {type(e).__name__}: {e}\n{traceback.format_exc()}")
+            _logger.exception("Failed to parse %s", s["id"])
             result.append({**s, "title": "Error parsing session", "error": True, "error_detail": f"{type(e).__name__}: {e}"})
     return jsonify(result)
@@ -1,12 +1,16 @@
-"""Search endpoint. Brute-force substring match across all sessions."""
+"""Search endpoint. Substring match across all sessions, served from the
+SQLite full-text index when available and a brute-force scan otherwise."""
 
+import contextlib
 import os
+import sqlite3
 
 from flask import Blueprint, current_app, jsonify, request
 
-from utils.session_path import get_claude_projects_dir, list_projects, list_sessions
+from utils.session_path import list_projects, list_sessions
 from utils.jsonl_parser import parse_session
-from utils.exclusion_rules import build_searchable_text, is_excluded_by_rules
+from utils.exclusion_rules import ExclusionMatcher, iter_searchable_parts
+from utils.search_index import open_search_index
 
 search_bp = Blueprint("search", __name__)
 
@@ -18,12 +22,78 @@ def search():
         return jsonify([])
 
     max_results = int(request.args.get("limit", 50))
-    base = current_app.config.get("CLAUDE_PROJECTS_DIR") or get_claude_projects_dir()
+    base = current_app.config["CLAUDE_PROJECTS_DIR"]
+    # The compiled matcher scans for its minimal set of terms in one place
+    # (one Aho-Corasick pass for big rule files), rather than walking every
+    # rule's clauses the way is_excluded_by_rules() does.
+    matcher = current_app.config.get("EXCLUSION_MATCHER")
+
+    index = _get_search_index()
+    if index is not None:
+        try:
+            # refresh() stores excluded sessions without any text, so the
+            # hits need no second exclusion check.
+            index.refresh(base, matcher)
+            return jsonify(_search_index(index, base, query, max_results))
+        except sqlite3.Error as e:
+            current_app.logger.warning("Search index query failed, scanning instead: %s", e)
+
+    return jsonify(_search_scan(base, query, max_results, matcher))
+
+
+def _get_search_index():
+    """Open the index on first use and keep it for the app's lifetime.
+    A failed open is remembered too, so we don't retry it per request."""
+    extensions = current_app.extensions
+    if "search_index" not in extensions:
+        extensions["search_index"] = open_search_index(
+            current_app.config.get("SEARCH_INDEX_PATH")
+        )
+    return extensions["search_index"]
+
+
+def _search_index(index, base: str, query: str, max_results: int) -> list:
+    results = []
+    with contextlib.closing(index.search(base, query)) as hits:
+        for hit in hits:
+            text = hit["text"]
+            # Confirm the FTS candidate with the same test the scan uses.
+            idx = text.lower().find(query)
+            if idx == -1:
+                continue
+
+            start = max(0, idx - 80)
+            end = min(len(text), idx + len(query) + 80)
+            results.append({
+                "project": hit["project"],
+                "session_id": hit["session_id"],
+                "title": hit["title"],
+                "role": hit["role"],
+                "timestamp": hit["timestamp"],
+                "snippet": text[start:end],
+            })
+            if len(results) >= max_results:
+                break
+    return results
+
+
+def _searchable_parts(session: dict, project_name: str):
+    return iter_searchable_parts(
+        project_name=project_name,
+        session_title=session["title"],
+        model_names=session["metadata"].get("models_used"),
+        content_parts=(msg.get("text") for msg in session.get("messages", [])),
+    )
+
+
+def _search_scan(base: str, query: str, max_results: int, matcher: ExclusionMatcher | None) -> list:
+    """Fallback when there is no index: parse every session and scan it."""
     projects = list_projects(base)
 
-    rules = current_app.config.get("EXCLUSION_RULES") or []
     results = []
     for project in projects:
+        if len(results) >= max_results:
+            break
         sessions = list_sessions(project["path"])
         for sess_info in sessions:
             if len(results) >= max_results:
@@ -33,36 +103,29 @@ def search():
             except Exception:
                 continue
 
-            if rules:
-                meta = session["metadata"]
-                text_parts = [msg.get("text") or "" for msg in session.get("messages", []) if msg.get("text")]
-                searchable = build_searchable_text(
-                    project_name=project["name"],
-                    session_title=session["title"],
-                    model_names=list(meta.get("models_used") or []),
-                    content_snippet="\n\n".join(text_parts),
-                )
-                if is_excluded_by_rules(rules, searchable):
+            if matcher:
+                if matcher.matches_chunks(_searchable_parts(session, project["name"])):
                     continue
 
             for msg in session["messages"]:
                 text = msg.get("text", "") or msg.get("content", "")
-                if query in text.lower():
-                    # Find the matching snippet
-                    idx = text.lower().index(query)
-                    start = max(0, idx - 80)
-                    end = min(len(text), idx + len(query) + 80)
-                    snippet = text[start:end]
-
-                    results.append({
-                        "project": project["name"],
-                        "session_id": session["session_id"],
-                        "title": session["title"],
-                        "role": msg["role"],
-                        "timestamp": msg.get("timestamp"),
-                        "snippet": snippet,
-                    })
-                    if len(results) >= max_results:
-                        break
-
-    return jsonify(results)
+                idx = text.lower().find(query)
+                if idx == -1:
+                    continue
+                # Find the matching snippet
+                start = max(0, idx - 80)
+                end = min(len(text), idx + len(query) + 80)
+                snippet = text[start:end]
+
+                results.append({
+                    "project": project["name"],
+                    "session_id": session["session_id"],
+                    "title": session["title"],
+                    "role": msg["role"],
+                    "timestamp": msg.get("timestamp"),
+                    "snippet": snippet,
+                })
+                if len(results) >= max_results:
+                    break
+
+    return results
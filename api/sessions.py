@@ -1,47 +1,139 @@
 """Session detail and stats endpoints."""
 
+import functools
+import logging
 import os
-import traceback
+import time
+from collections.abc import Iterator
 
-from flask import Blueprint, current_app, jsonify, abort
+from flask import Blueprint, Response, abort, current_app, jsonify, make_response
 
-from utils.session_path import get_claude_projects_dir, safe_join
-from utils.jsonl_parser import parse_session
-from utils.session_stats import compute_stats
-from utils.exclusion_rules import build_searchable_text, is_excluded_by_rules
+from utils import fastjson
+from utils.session_path import safe_join_cached, stat_file
+from utils.jsonl_parser import parse_session_cached
+from utils.session_stats import compute_stats_streaming
+from utils.exclusion_rules import iter_searchable_parts
 
 sessions_bp = Blueprint("sessions", __name__)
 
+_logger = logging.getLogger(__name__)
 
-@sessions_bp.route("/api/sessions/<path:project_name>/<session_id>")
-def get_session(project_name, session_id):
-    base = current_app.config.get("CLAUDE_PROJECTS_DIR") or get_claude_projects_dir()
+
+# Paths that 404'd recently -> monotonic expiry, so a client polling a
+# deleted session is answered from memory instead of the filesystem.
+_MISSING_TTL = 5.0
+_MISSING_MAX = 1024
+_missing: dict[str, float] = {}
+
+
+def _stat_session(filepath: str) -> os.stat_result | None:
+    """stat_file() with a short negative cache in front of it."""
+    now = time.monotonic()
+    expiry = _missing.get(filepath)
+    if expiry is not None:
+        if expiry > now:
+            return None
+        _missing.pop(filepath, None)
+    st = stat_file(filepath)
+    if st is None:
+        if len(_missing) >= _MISSING_MAX:
+            # Oldest first: dicts keep insertion order.
+            _missing.pop(next(iter(_missing), None), None)
+        _missing[filepath] = now + _MISSING_TTL
+    return st
+
+
+def _compute_stats_cached(filepath: str, st: os.stat_result) -> dict:
+    """Session stats memoized on the file's (mtime, size), like
+    parse_session_cached(). A miss folds the file in as it's read rather
+    than parsing it into a full session first."""
+    return _compute_stats_keyed(filepath, st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=256)
+def _compute_stats_keyed(filepath: str, mtime_ns: int, size: int) -> dict:
+    return compute_stats_streaming(filepath)
+
+
+# Messages per chunk when streaming a session out.
+_MESSAGES_PER_CHUNK = 200
+
+
+def _iter_session_json(session: dict, default) -> Iterator[bytes]:
+    """Encode *session* as one JSON object, a batch of messages at a time,
+    so big transcripts start flowing before the whole body is encoded.
+
+    Keys keep the session's own order. Everything but the later message
+    batches is encoded before this returns, so a serialization error there
+    still reaches the caller's 500 handler rather than truncating a 200.
+    """
+    dumps = fastjson.dumps
+    keys = list(session)
+    at = keys.index("messages")
+    before = dumps({k: session[k] for k in keys[:at]}, default=default)
+    after = dumps({k: session[k] for k in keys[at + 1:]}, default=default)
+    head = before[:-1] + (b',"messages":[' if len(before) > 2 else b'"messages":[')
+    tail = (b"]," + after[1:] if len(after) > 2 else b"]}") + b"\n"
+
+    messages = session["messages"]
+    first = b",".join(dumps(m, default=default) for m in messages[:_MESSAGES_PER_CHUNK])
+
+    def chunks():
+        yield head
+        yield first
+        try:
+            for i in range(_MESSAGES_PER_CHUNK, len(messages), _MESSAGES_PER_CHUNK):
+                batch = messages[i:i + _MESSAGES_PER_CHUNK]
+                yield b"," + b",".join(dumps(m, default=default) for m in batch)
+        except Exception:
+            # Headers are gone by now; all that's left is to log it.
+            _logger.exception("Failed to stream session %s", session.get("session_id"))
+            raise
+        yield tail
+
+    return chunks()
+
+
+def _locate_session(project_name: str, session_id: str) -> tuple[str, os.stat_result]:
+    """Validated path and stat result for a session file. Aborts with the
+    JSON 400/404 the endpoints return for bad or missing sessions."""
+    base = current_app.config["CLAUDE_PROJECTS_DIR"]
     try:
-        filepath = safe_join(base, project_name, f"{session_id}.jsonl")
+        filepath = safe_join_cached(base, project_name, f"{session_id}.jsonl")
     except ValueError:
-        return jsonify({"error": "Invalid path"}), 400
+        abort(make_response(jsonify({"error": "Invalid path"}), 400))
+
+    st = _stat_session(filepath)
+    if st is None:
+        abort(make_response(jsonify({"error": f"Session {session_id} not found"}), 404))
+    return filepath, st
 
-    if not os.path.isfile(filepath):
-        return jsonify({"error": f"Session {session_id} not found"}), 404
+
+@sessions_bp.route("/api/sessions/<path:project_name>/<session_id>")
+def get_session(project_name, session_id):
+    filepath, st = _locate_session(project_name, session_id)
 
     try:
-        session = parse_session(filepath)
-        rules = current_app.config.get("EXCLUSION_RULES") or []
-        if rules:
+        session = parse_session_cached(filepath, st)
+        # The matcher is built once in create_app(); it's falsy when there
+        # are no rules, so the common case skips straight to the response.
+        matcher = current_app.config.get("EXCLUSION_MATCHER")
+        if matcher:
             meta = session["metadata"]
-            text_parts = [msg.get("text") or "" for msg in session.get("messages", []) if msg.get("text")]
-            searchable = build_searchable_text(
+            searchable = iter_searchable_parts(
                 project_name=project_name,
                 session_title=session["title"],
-                model_names=list(meta.get("models_used") or []),
-                content_snippet="\n\n".join(text_parts),
+                model_names=meta.get("models_used"),
+                content_parts=(msg.get("text") for msg in session.get("messages", [])),
             )
-            if is_excluded_by_rules(rules, searchable):
+            if matcher.matches_chunks(searchable):
                 return jsonify({"error": "Session not found"}), 404
-        return jsonify(session)
+        return Response(
+            _iter_session_json(session, current_app.json.default),
+            mimetype="application/json",
+        )
     except Exception as e:
-        tb = traceback.format_exc()
-        print(f"[ERROR] Failed to parse session {session_id}: {e}\n{tb}")
+        _logger.exception("Failed to parse session %s", session_id)
         return jsonify({
             "error": f"Failed to parse session: {type(e).__name__}: {e}",
         }), 500
@@ -49,22 +141,12 @@ def get_session(project_name, session_id):
 
 @sessions_bp.route("/api/sessions/<path:project_name>/<session_id>/stats")
 def get_session_stats(project_name, session_id):
-    base = current_app.config.get("CLAUDE_PROJECTS_DIR") or get_claude_projects_dir()
-    try:
-        filepath = safe_join(base, project_name, f"{session_id}.jsonl")
-    except ValueError:
-        return jsonify({"error": "Invalid path"}), 400
-
-    if not os.path.isfile(filepath):
-        return jsonify({"error": f"Session {session_id} not found"}), 404
+    filepath, st = _locate_session(project_name, session_id)
 
     try:
-        session = parse_session(filepath)
-        stats = compute_stats(session)
-        return jsonify(stats)
+        return jsonify(_compute_stats_cached(filepath, st))
     except Exception as e:
-        tb = traceback.format_exc()
-        print(f"[ERROR] Failed to compute stats for {session_id}: {e}\n{tb}")
+        _logger.exception("Failed to compute stats for %s", session_id)
         return jsonify({
             "error": f"Failed to compute stats: {type(e).__name__}: {e}",
         }), 500
@@ -1,36 +1,91 @@
 """Flask app that serves the web GUI for browsing sessions."""
 
+import hashlib
 import os
 import sys
 
-from flask import Flask
+from flask import Flask, request
+from flask.json.provider import DefaultJSONProvider
 
 from api.projects import projects_bp
 from api.sessions import sessions_bp
 from api.search import search_bp
 from api.export_api import export_bp
-from utils.exclusion_rules import resolve_exclusion_rules_path, load_rules
+from utils import fastjson
+from utils.session_path import get_claude_projects_dir
+from utils.exclusion_rules import resolve_exclusion_rules_path, load_rules, compile_rules
+from utils.search_index import get_default_search_index_path
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """jsonify() through utils.fastjson, i.e. orjson when it's installed.
+
+    Keys keep their insertion order and non-ASCII text goes out as UTF-8
+    rather than being sorted and escaped.  Only dumps() is replaced; the
+    base response() still packs the arguments and picks indented output
+    in debug mode.  Anything fastjson can't express (sort_keys, other
+    indents or options) falls back to the stdlib.
+    """
+
+    sort_keys = False
+    ensure_ascii = False
+
+    def dumps(self, obj, **kwargs) -> str:
+        indent = kwargs.get("indent")
+        if (
+            self.sort_keys
+            or indent not in (None, 2)
+            or kwargs.get("separators", (",", ":")) != (",", ":")
+            or set(kwargs) - {"indent", "separators"}
+        ):
+            return super().dumps(obj, **kwargs)
+        return fastjson.dumps(obj, default=self.default, indent=bool(indent)).decode("utf-8")
 
 
 def create_app(
     base_dir: str | None = None,
     exclusion_rules_path: str | None = None,
+    search_index: bool = True,
 ) -> Flask:
     app = Flask(__name__)
-    app.config["CLAUDE_PROJECTS_DIR"] = base_dir
+    app.json = FastJSONProvider(app)
+    # Resolved once here so the endpoints never fall back per request.
+    app.config["CLAUDE_PROJECTS_DIR"] = base_dir or get_claude_projects_dir()
 
     resolved = resolve_exclusion_rules_path(exclusion_rules_path)
     app.config["EXCLUSION_RULES_PATH"] = resolved
     app.config["EXCLUSION_RULES"] = load_rules(resolved)
+    app.config["EXCLUSION_MATCHER"] = compile_rules(app.config["EXCLUSION_RULES"])
+    # The index holds plaintext copies of message text; None turns it off
+    # and search scans the session files instead.
+    app.config["SEARCH_INDEX_PATH"] = get_default_search_index_path() if search_index else None
 
     app.register_blueprint(projects_bp)
     app.register_blueprint(sessions_bp)
     app.register_blueprint(search_bp)
     app.register_blueprint(export_bp)
 
+    index_html = None
+    if os.environ.get("FLASK_DEBUG") != "1":
+        # The SPA shell never changes while the server runs, so read it once
+        # and answer revalidations with 304s off a precomputed ETag. Debug
+        # runs keep reading it from disk so edits show up on refresh.
+        try:
+            with open(os.path.join(app.static_folder, "index.html"), "rb") as f:
+                index_html = f.read()
+        except OSError:
+            pass
+    index_etag = hashlib.sha1(index_html).hexdigest() if index_html is not None else None
+
     @app.route("/")
     def index():
-        return app.send_static_file("index.html")
+        if index_html is None:
+            return app.send_static_file("index.html")
+        rv = app.response_class(index_html, mimetype="text/html")
+        rv.set_etag(index_etag)
+        rv.cache_control.public = True
+        rv.cache_control.max_age = 60
+        return rv.make_conditional(request)
 
     return app
 
@@ -49,13 +104,26 @@ if __name__ == "__main__":
         help="Path to exclusion rules file (sensitive sessions are omitted). "
              "If omitted, uses ~/.claude-code-chat-browser/exclusion-rules.txt if present.",
     )
+    parser.add_argument(
+        "--no-search-index",
+        action="store_true",
+        help="Don't keep a copy of message text in ~/.claude-code-chat-browser/search.db; "
+             "search scans the session files instead.",
+    )
     args = parser.parse_args()
 
-    app = create_app(base_dir=args.base_dir, exclusion_rules_path=args.exclude_rules)
+    app = create_app(
+        base_dir=args.base_dir,
+        exclusion_rules_path=args.exclude_rules,
+        search_index=not args.no_search_index,
+    )
     print(f"Claude Code Chat Browser running at http://{args.host}:{args.port}")
+    # Debug mode (and its reloader, which keeps stat()ing the source tree)
+    # is opt-in: FLASK_DEBUG=1 python app.py
+    debug = os.environ.get("FLASK_DEBUG") == "1"
     app.run(
         host=args.host,
         port=args.port,
-        debug=True,
-        use_reloader=(sys.platform != "win32"),
+        debug=debug,
+        use_reloader=debug and sys.platform != "win32",
     )
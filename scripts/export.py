@@ -12,10 +12,19 @@ Examples:
 """
 
 import argparse
+import functools
+import hashlib
+import heapq
 import json
 import os
+import re
 import sys
+import time
 import zipfile
+from collections import Counter, deque
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 
 # Allow running from repo root or scripts/ directory
@@ -23,22 +32,32 @@ SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 REPO_ROOT = os.path.dirname(SCRIPT_DIR)
 sys.path.insert(0, REPO_ROOT)
 
+from utils import fastjson
 from utils.session_path import get_claude_projects_dir, list_projects, list_sessions
-from utils.jsonl_parser import parse_session
+from utils.jsonl_parser import parse_session_cached, quick_session_title_cached
 from utils.session_stats import compute_stats, _format_duration
 from utils.md_exporter import session_to_markdown
-from utils.json_exporter import session_to_json
+from utils.json_exporter import dump_session, session_to_json
 from utils.exclusion_rules import (
     resolve_exclusion_rules_path,
     load_rules,
+    compile_rules,
+    iter_searchable_parts,
     build_searchable_text,
-    is_excluded_by_rules,
 )
 
 
 STATE_DIR = os.path.join(os.path.expanduser("~"), ".claude-code-chat-browser")
 STATE_FILE = os.path.join(STATE_DIR, "export_state.json")
 
+_WRITE_BUFFER = 1 << 20
+
+# How many sessions a --no-zip export writes between state checkpoints.
+_CHECKPOINT_EVERY = 50
+
+# File extensions rendered for each --format value.
+_FORMAT_EXTS = {"md": ("md",), "json": ("json",), "both": ("md", "json")}
+
 
 def main():
     parser = build_parser()
@@ -57,13 +76,12 @@ def cmd_list(args):
     """Print a table of projects, or drill into one project's sessions."""
     base_dir = getattr(args, "base_dir", None) or get_claude_projects_dir()
     project_filter = getattr(args, "project", None)
+    limit = getattr(args, "limit", None)
 
     if not os.path.isdir(base_dir):
         _die(f"Claude Code projects directory not found: {base_dir}")
 
-    projects = list_projects(base_dir)
-    if project_filter:
-        projects = [p for p in projects if project_filter in p["name"]]
+    projects = list_projects(base_dir, name_filter=project_filter)
 
     if not projects:
         print("No projects found.")
@@ -71,43 +89,62 @@ def cmd_list(args):
 
     # If a specific project is selected, list its sessions
     if project_filter and len(projects) == 1:
-        _list_sessions(projects[0])
+        _list_sessions(projects[0], limit)
         return
 
+    by_modified = lambda x: x.get("last_modified", "")
+    if limit:
+        shown = heapq.nlargest(limit, projects, key=by_modified)
+    else:
+        shown = sorted(projects, key=by_modified, reverse=True)
+
     # Otherwise list all projects
-    print(f"Projects ({len(projects)} found):\n")
-    print(f"  {'Project':<45} {'Sessions':>8}   {'Last Modified'}")
-    print(f"  {chr(9472) * 45} {chr(9472) * 8}   {chr(9472) * 19}")
-    for p in sorted(projects, key=lambda x: x.get("last_modified", ""), reverse=True):
+    lines = []
+    emit = lines.append
+    emit(f"Projects ({len(projects)} found):\n")
+    emit(f"  {'Project':<45} {'Sessions':>8}   {'Last Modified'}")
+    emit(f"  {chr(9472) * 45} {chr(9472) * 8}   {chr(9472) * 19}")
+    for p in shown:
         name = p.get("display_name") or p["name"]
         count = p.get("session_count", 0)
         modified = p.get("last_modified", "")[:19].replace("T", " ")
-        print(f"  {name:<45} {count:>8}   {modified}")
+        emit(f"  {name:<45} {count:>8}   {modified}")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
-def _list_sessions(project: dict):
-    """Print each session in a project with title, tokens, tool count."""
+def _list_sessions(project: dict, limit: int | None = None):
+    """Print each session in a project with title, tokens, tool count.
+    With *limit*, stop after that many of the most recent titled ones."""
     sessions = list_sessions(project["path"])
     name = project.get("display_name") or project["name"]
-    print(f"Sessions in {name} ({len(sessions)} found):\n")
-    print(f"  {'Date':<12} {'Title':<50} {'ID':>10} {'Tokens':>10} {'Tools':>6}")
-    print(f"  {chr(9472) * 12} {chr(9472) * 50} {chr(9472) * 10} {chr(9472) * 10} {chr(9472) * 6}")
-
+    lines = []
+    emit = lines.append
+    emit(f"Sessions in {name} ({len(sessions)} found):\n")
+    emit(f"  {'Date':<12} {'Title':<50} {'ID':>10} {'Tokens':>10} {'Tools':>6}")
+    emit(f"  {chr(9472) * 12} {chr(9472) * 50} {chr(9472) * 10} {chr(9472) * 10} {chr(9472) * 6}")
+
+    # Untitled sessions aren't shown, so the cut can't be made up front;
+    # walking newest-first and stopping early still saves the parses.
+    shown = 0
     for s in sorted(sessions, key=lambda x: x.get("modified", 0), reverse=True):
+        if limit and shown >= limit:
+            break
         try:
-            parsed = parse_session(s["path"])
-            if parsed["title"] == "Untitled Session":
+            if quick_session_title_cached(s["path"]) == "Untitled Session":
                 continue
+            parsed = parse_session_cached(s["path"])
             meta = parsed["metadata"]
             ts = (meta.get("first_timestamp") or "")[:10]
             title = parsed["title"][:50]
             sid = s["id"][:10]
             tokens = meta["total_input_tokens"] + meta["total_output_tokens"]
             tools = meta["total_tool_calls"]
-            print(f"  {ts:<12} {title:<50} {sid:>10} {tokens:>10,} {tools:>6}")
+            emit(f"  {ts:<12} {title:<50} {sid:>10} {tokens:>10,} {tools:>6}")
+            shown += 1
         except Exception as e:
             print(f"  Warning: failed to parse {s['id'][:10]}: {e}", file=sys.stderr)
             continue
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def cmd_stats(args):
@@ -116,61 +153,64 @@ def cmd_stats(args):
     project_filter = getattr(args, "project", None)
     session_id = getattr(args, "session", None)
     fmt = getattr(args, "format", "text") or "text"
+    use_cache = not getattr(args, "no_cache", False)
 
     if not os.path.isdir(base_dir):
         _die(f"Claude Code projects directory not found: {base_dir}")
 
     if session_id:
-        _session_stats(session_id, base_dir, fmt)
+        _session_stats(session_id, base_dir, fmt, use_cache)
     else:
-        _aggregate_stats(base_dir, project_filter, fmt)
+        _aggregate_stats(base_dir, project_filter, fmt, use_cache)
 
 
-def _session_stats(session_id: str, base_dir: str, fmt: str):
+def _session_stats(session_id: str, base_dir: str, fmt: str, use_cache: bool = True):
     """Detailed breakdown for one session: tokens, files, commands, cost."""
     filepath = _find_session(session_id, base_dir)
     if not filepath:
         _die(f"Session not found: {session_id}")
 
-    session = parse_session(filepath)
-    stats = compute_stats(session)
+    session = _session_summary(filepath, use_cache)
+    stats = session["stats"]
 
     if fmt == "json":
         print(json.dumps(stats, indent=2, default=str))
         return
 
     meta = session["metadata"]
-    print(f"=== Session: {session_id[:12]} ===\n")
-    print(f"  Title:      {session['title']}")
+    lines = []
+    emit = lines.append
+    emit(f"=== Session: {session_id[:12]} ===\n")
+    emit(f"  Title:      {session['title']}")
     if meta["first_timestamp"]:
-        print(f"  Created:    {meta['first_timestamp'][:19]}")
+        emit(f"  Created:    {meta['first_timestamp'][:19]}")
     dur = _format_duration(meta.get("session_wall_time_seconds"))
     if dur:
-        print(f"  Duration:   {dur}")
-    print(f"  Models:     {', '.join(meta['models_used']) or 'unknown'}")
+        emit(f"  Duration:   {dur}")
+    emit(f"  Models:     {', '.join(meta['models_used']) or 'unknown'}")
     inp = meta["total_input_tokens"]
     out = meta["total_output_tokens"]
-    print(f"  Tokens:     {inp + out:,} (input: {inp:,} / output: {out:,})")
+    emit(f"  Tokens:     {inp + out:,} (input: {inp:,} / output: {out:,})")
     cache_r = meta["total_cache_read_tokens"]
     cache_c = meta["total_cache_creation_tokens"]
     if cache_r or cache_c:
-        print(f"  Cache:      read: {cache_r:,} / creation: {cache_c:,}")
-    print(f"  Tool calls: {meta['total_tool_calls']}")
+        emit(f"  Cache:      read: {cache_r:,} / creation: {cache_c:,}")
+    emit(f"  Tool calls: {meta['total_tool_calls']}")
     if meta["tool_call_counts"]:
         breakdown = ", ".join(
             f"{t}: {c}" for t, c in sorted(
                 meta["tool_call_counts"].items(), key=lambda x: -x[1]
             )
         )
-        print(f"              {breakdown}")
+        emit(f"              {breakdown}")
     if meta.get("stop_reasons"):
         sr = ", ".join(f"{r}: {c}" for r, c in meta["stop_reasons"].items())
-        print(f"  Stop:       {sr}")
+        emit(f"  Stop:       {sr}")
 
     ft = stats.get("files_touched", {})
     total_files = ft.get("total_unique", 0)
     if total_files:
-        print(
+        emit(
             f"  Files:      {total_files} unique "
             f"({len(ft.get('read', []))} read, "
             f"{len(ft.get('written', []))} edited, "
@@ -181,105 +221,210 @@ def _session_stats(session_id: str, base_dir: str, fmt: str):
         trs = stats.get("tool_result_summary", {})
         ok = trs.get("bash_success", 0)
         err = trs.get("bash_error", 0)
-        print(f"  Commands:   {len(cmds)} run ({ok} success, {err} error)")
+        emit(f"  Commands:   {len(cmds)} run ({ok} success, {err} error)")
     if meta.get("compactions"):
-        print(f"  Compactions: {meta['compactions']}")
+        emit(f"  Compactions: {meta['compactions']}")
     if meta.get("api_errors"):
-        print(f"  API errors: {meta['api_errors']}")
+        emit(f"  API errors: {meta['api_errors']}")
     cost = stats.get("cost_estimate_usd")
     if cost is not None:
-        print(f"  Est. cost:  ~${cost:.2f} USD")
+        emit(f"  Est. cost:  ~${cost:.2f} USD")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
-def _aggregate_stats(base_dir: str, project_filter: str, fmt: str):
+def _aggregate_stats(base_dir: str, project_filter: str, fmt: str, use_cache: bool = True):
     """Sum up tokens, tools, cost across every session. Optionally filter
     by project."""
-    projects = list_projects(base_dir)
-    if project_filter:
-        projects = [p for p in projects if project_filter in p["name"]]
-
-    totals = {
-        "projects": len(projects),
-        "sessions": 0,
-        "input_tokens": 0,
-        "output_tokens": 0,
-        "cache_read_tokens": 0,
-        "cache_creation_tokens": 0,
-        "tool_calls": 0,
-        "tool_counts": {},
-        "models": set(),
-        "files_unique": set(),
-        "commands_run": 0,
-        "compactions": 0,
-        "api_errors": 0,
-        "total_cost": 0.0,
-        "has_cost": False,
-    }
-
-    for project in projects:
-        sessions = list_sessions(project["path"])
-        for s in sessions:
-            try:
-                session = parse_session(s["path"])
-                if session["title"] == "Untitled Session":
-                    continue
-                meta = session["metadata"]
-                stats = compute_stats(session)
-
-                totals["sessions"] += 1
-                totals["input_tokens"] += meta["total_input_tokens"]
-                totals["output_tokens"] += meta["total_output_tokens"]
-                totals["cache_read_tokens"] += meta["total_cache_read_tokens"]
-                totals["cache_creation_tokens"] += meta["total_cache_creation_tokens"]
-                totals["tool_calls"] += meta["total_tool_calls"]
-                for t, c in meta["tool_call_counts"].items():
-                    totals["tool_counts"][t] = totals["tool_counts"].get(t, 0) + c
-                totals["models"].update(meta["models_used"])
-                ft = stats.get("files_touched", {})
-                for category in ("read", "written", "created"):
-                    totals["files_unique"].update(ft.get(category, []))
-                totals["commands_run"] += len(stats.get("commands_run", []))
-                totals["compactions"] += meta.get("compactions", 0)
-                totals["api_errors"] += meta.get("api_errors", 0)
-                cost = stats.get("cost_estimate_usd")
-                if cost is not None:
-                    totals["total_cost"] += cost
-                    totals["has_cost"] = True
-            except Exception as e:
-                print(f"  Warning: failed to parse {s['id'][:10]} in {project['name']}: {e}", file=sys.stderr)
-                continue
+    projects = _enumerate_all(base_dir, project_filter)
+
+    totals = _Totals(projects=len(projects))
+
+    tasks = [
+        (s["path"], s["id"], project["name"], use_cache)
+        for project, sessions in projects
+        for s in sessions
+    ]
+    # Each session's totals are folded in as soon as its worker returns it,
+    # with a progress line on an interactive stderr for big corpora.
+    progress = sys.stderr.isatty() and len(tasks) >= 100
+    results = _parallel_map(_session_totals, tasks, paths=[t[0] for t in tasks])
+    for done, partial in enumerate(results, 1):
+        if progress and (done % 50 == 0 or done == len(tasks)):
+            print(f"\r  Parsed {done}/{len(tasks)} sessions", end="", file=sys.stderr, flush=True)
+        if partial is None:
+            continue
+        if "error" in partial:
+            print(partial["error"], file=sys.stderr)
+            continue
+        _merge_totals(totals, partial)
+    if progress:
+        print(file=sys.stderr)
+    if use_cache and not project_filter:
+        _prune_stats_cache({t[1] for t in tasks})
 
     if fmt == "json":
-        out = dict(totals)
+        out = {f.name: getattr(totals, f.name) for f in fields(totals)}
+        out["tool_counts"] = dict(out["tool_counts"])
         out["models"] = sorted(out["models"])
         out["files_unique"] = len(out["files_unique"])
         print(json.dumps(out, indent=2, default=str))
         return
 
-    total_tokens = totals["input_tokens"] + totals["output_tokens"]
-    print("=== Aggregate Stats ===\n")
-    print(f"  Projects:     {totals['projects']}")
-    print(f"  Sessions:     {totals['sessions']}")
-    print(f"  Models:       {', '.join(sorted(totals['models'])) or 'none'}")
-    print(f"  Total tokens: {total_tokens:,} (input: {totals['input_tokens']:,} / output: {totals['output_tokens']:,})")
-    if totals["cache_read_tokens"]:
-        print(f"  Cache:        read: {totals['cache_read_tokens']:,} / creation: {totals['cache_creation_tokens']:,}")
-    print(f"  Tool calls:   {totals['tool_calls']:,}")
-    if totals["tool_counts"]:
+    total_tokens = totals.input_tokens + totals.output_tokens
+    lines = []
+    emit = lines.append
+    emit("=== Aggregate Stats ===\n")
+    emit(f"  Projects:     {totals.projects}")
+    emit(f"  Sessions:     {totals.sessions}")
+    emit(f"  Models:       {', '.join(sorted(totals.models)) or 'none'}")
+    emit(f"  Total tokens: {total_tokens:,} (input: {totals.input_tokens:,} / output: {totals.output_tokens:,})")
+    if totals.cache_read_tokens:
+        emit(f"  Cache:        read: {totals.cache_read_tokens:,} / creation: {totals.cache_creation_tokens:,}")
+    emit(f"  Tool calls:   {totals.tool_calls:,}")
+    if totals.tool_counts:
         breakdown = ", ".join(
             f"{t}: {c}" for t, c in sorted(
-                totals["tool_counts"].items(), key=lambda x: -x[1]
+                totals.tool_counts.items(), key=lambda x: -x[1]
             )[:10]
         )
-        print(f"                {breakdown}")
-    print(f"  Files:        {len(totals['files_unique']):,} unique")
-    print(f"  Commands:     {totals['commands_run']:,}")
-    if totals["compactions"]:
-        print(f"  Compactions:  {totals['compactions']}")
-    if totals["api_errors"]:
-        print(f"  API errors:   {totals['api_errors']}")
-    if totals["has_cost"]:
-        print(f"  Est. cost:    ~${totals['total_cost']:.2f} USD")
+        emit(f"                {breakdown}")
+    emit(f"  Files:        {len(totals.files_unique):,} unique")
+    emit(f"  Commands:     {totals.commands_run:,}")
+    if totals.compactions:
+        emit(f"  Compactions:  {totals.compactions}")
+    if totals.api_errors:
+        emit(f"  API errors:   {totals.api_errors}")
+    if totals.has_cost:
+        emit(f"  Est. cost:    ~${totals.total_cost:.2f} USD")
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+@dataclass(slots=True)
+class _Totals:
+    """Running sums for _aggregate_stats; field order is the JSON output order."""
+    projects: int = 0
+    sessions: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_creation_tokens: int = 0
+    tool_calls: int = 0
+    tool_counts: Counter = field(default_factory=Counter)
+    models: set = field(default_factory=set)
+    files_unique: set = field(default_factory=set)
+    commands_run: int = 0
+    compactions: int = 0
+    api_errors: int = 0
+    total_cost: float = 0.0
+    has_cost: bool = False
+
+
+def _merge_totals(totals: _Totals, partial: dict):
+    """Add one session's _session_totals() result into *totals*."""
+    totals.sessions += 1
+    totals.input_tokens += partial["input_tokens"]
+    totals.output_tokens += partial["output_tokens"]
+    totals.cache_read_tokens += partial["cache_read_tokens"]
+    totals.cache_creation_tokens += partial["cache_creation_tokens"]
+    totals.tool_calls += partial["tool_calls"]
+    totals.commands_run += partial["commands_run"]
+    totals.compactions += partial["compactions"]
+    totals.api_errors += partial["api_errors"]
+    totals.tool_counts.update(partial["tool_counts"])
+    totals.models.update(partial["models"])
+    totals.files_unique.update(partial["files"])
+    if partial["cost"] is not None:
+        totals.total_cost += partial["cost"]
+        totals.has_cost = True
+
+
+def _session_totals(task: tuple) -> dict | None:
+    """Worker for _aggregate_stats: parse one session and return the numbers
+    it contributes to the totals. None for untitled sessions; a dict with
+    just an "error" message if parsing failed."""
+    path, sid, project_name, use_cache = task
+    try:
+        if quick_session_title_cached(path) == "Untitled Session":
+            return None
+        session = _session_summary(path, use_cache)
+        meta = session["metadata"]
+        stats = session["stats"]
+        ft = stats.get("files_touched", {})
+        return {
+            "input_tokens": meta["total_input_tokens"],
+            "output_tokens": meta["total_output_tokens"],
+            "cache_read_tokens": meta["total_cache_read_tokens"],
+            "cache_creation_tokens": meta["total_cache_creation_tokens"],
+            "tool_calls": meta["total_tool_calls"],
+            "tool_counts": meta["tool_call_counts"],
+            "models": meta["models_used"],
+            "files": [f for category in ("read", "written", "created")
+                      for f in ft.get(category, [])],
+            "commands_run": len(stats.get("commands_run", [])),
+            "compactions": meta.get("compactions", 0),
+            "api_errors": meta.get("api_errors", 0),
+            "cost": stats.get("cost_estimate_usd"),
+        }
+    except Exception as e:
+        return {"error": f"  Warning: failed to parse {sid[:10]} in {project_name}: {e}"}
+
+
+def _session_summary(path: str, use_cache: bool = True) -> dict:
+    """Title, metadata and compute_stats() of the session at *path* -- all
+    the stats commands need, without the messages.
+
+    Saved as JSON to STATE_DIR/stats_cache/<sid>.json along with the file's
+    (mtime_ns, size), so a repeat run only parses sessions that changed; a
+    stale entry is simply overwritten. *use_cache=False* (--no-cache)
+    neither reads nor writes the cache.
+    """
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+    sid = os.path.basename(path).replace(".jsonl", "")
+    cache_dir = os.path.join(STATE_DIR, "stats_cache")
+    cache_file = os.path.join(cache_dir, f"{sid}.json")
+    if use_cache:
+        try:
+            with open(cache_file, "rb") as f:
+                cached_key, summary = fastjson.loads(f.read())
+            if tuple(cached_key) == key:
+                return summary
+        except Exception:
+            pass  # missing or unreadable: rebuild it
+
+    session = parse_session_cached(path, st)
+    summary = {
+        "title": session["title"],
+        "metadata": session["metadata"],
+        "stats": compute_stats(session),
+    }
+    if use_cache:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp = f"{cache_file}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                # Any leftover sets in the metadata go out as sorted lists.
+                f.write(fastjson.dumps((key, summary), default=sorted))
+            os.replace(tmp, cache_file)
+        except OSError:
+            pass
+    return summary
+
+
+def _prune_stats_cache(live_ids: set):
+    """Drop stats cache entries for sessions that no longer exist."""
+    cache_dir = os.path.join(STATE_DIR, "stats_cache")
+    try:
+        names = os.listdir(cache_dir)
+    except OSError:
+        return
+    for name in names:
+        # .pkl files are from before the cache was JSON; nothing reads them.
+        if name.endswith(".pkl") or (name.endswith(".json") and name[:-5] not in live_ids):
+            try:
+                os.remove(os.path.join(cache_dir, name))
+            except OSError:
+                pass
 
 
 def cmd_export(args):
@@ -288,8 +433,14 @@ def cmd_export(args):
     out_dir = getattr(args, "out", None) or os.getcwd()
     since = getattr(args, "since", None) or "all"
     no_zip = getattr(args, "no_zip", False)
+    compress_level = getattr(args, "compress_level", None)
+    if compress_level is None:
+        # Level 3 like the web export: about half the CPU of the default 6
+        # for a few percent more bytes on markdown.
+        compress_level = 3
     project_filter = getattr(args, "project", None)
     fmt = getattr(args, "format", None) or "md"
+    dedupe = getattr(args, "dedupe", False)
     session_filter = getattr(args, "session", None)
     exclusion_rules_path = getattr(args, "exclude_rules", None)
 
@@ -297,23 +448,35 @@ def cmd_export(args):
         _die(f"Claude Code projects directory not found: {base_dir}")
 
     rules = load_rules(resolve_exclusion_rules_path(exclusion_rules_path))
-
-    state = _load_state() if since == "last" else {}
-    last_export = state.get("sessions", {})
+    # Compiled once here and shipped to every worker with its task.
+    matcher = compile_rules(rules)
+    # The same key the search index uses to notice a rules change.
+    rules_key = matcher.key
+
+    try:
+        state = _load_state()
+    except (OSError, ValueError):
+        if since == "last":
+            raise
+        state = {}
+    last_export = state.get("sessions", {}) if since == "last" else {}
+    # Rendered output of sessions that haven't changed since the last run is
+    # reused as-is. Different exclusion rules can change what gets exported,
+    # so the cache only counts if they're the same.
+    old_cache = state.get("cache", {}) if state.get("rulesKey") == rules_key else {}
+    render_cache = {}
 
     # Single session export
     if session_filter:
         filepath = _find_session(session_filter, base_dir)
         if not filepath:
             _die(f"Session not found: {session_filter}")
-        session = parse_session(filepath)
+        session = parse_session_cached(filepath)
         stats = compute_stats(session)
         _export_single(session, stats, fmt, out_dir)
         return
 
-    projects = list_projects(base_dir)
-    if project_filter:
-        projects = [p for p in projects if project_filter in p["name"]]
+    projects = _enumerate_all(base_dir, project_filter)
 
     if not projects:
         print("No projects found.")
@@ -321,166 +484,419 @@ def cmd_export(args):
 
     print(f"Found {len(projects)} project(s) in {base_dir}")
 
-    all_exports = []  # list of (rel_path, content)
     manifest = []
     total_sessions = 0
     skipped = 0
 
-    for project in projects:
-        sessions = list_sessions(project["path"])
+    tasks = []
+    plan = []  # per session: its cache entry, or None if a worker renders it
+    for project, sessions in projects:
+        project_meta = {
+            "name": project["name"],
+            "display_name": project.get("display_name") or project["name"],
+            "slug": _slugify(project["name"]),
+        }
         for sess_info in sessions:
             total_sessions += 1
-            sid = sess_info["id"]
 
             if since == "last":
-                prev_mtime = last_export.get(sid, 0)
+                prev_mtime = last_export.get(sess_info["id"], 0)
                 if sess_info["modified"] <= prev_mtime:
                     skipped += 1
                     continue
 
-            try:
-                session = parse_session(sess_info["path"])
-            except Exception as e:
-                print(f"  Warning: failed to parse {sid}: {e}")
-                continue
-
-            if session["title"] == "Untitled Session":
-                skipped += 1
-                continue
+            entry = _render_cache_hit(old_cache.pop(sess_info["id"], None), sess_info, fmt)
+            plan.append((sess_info, entry))
+            if entry is None:
+                tasks.append((sess_info, project_meta, fmt, matcher))
 
-            if rules:
-                meta = session["metadata"]
-                searchable = build_searchable_text(
-                    project_name=project.get("display_name") or project["name"],
-                    session_title=session["title"],
-                    model_names=list(meta.get("models_used") or []),
-                    content_snippet=_session_text_for_exclusion(session),
-                )
-                if is_excluded_by_rules(rules, searchable):
-                    skipped += 1
+    # Each export is written as soon as it is rendered, so memory use doesn't
+    # grow with the size of the corpus; only the manifest is kept.
+    results = _parallel_map(
+        _process_session, tasks, paths=[t[0]["path"] for t in tasks]
+    )
+    with _ExportSink(out_dir, no_zip, compress_level, dedupe) as sink:
+        for sess_info, entry in plan:
+            sid = sess_info["id"]
+            if entry is None:
+                status, payload = next(results)
+                if status != "ok":
+                    _drop_render(sid)
+                    if status == "error":
+                        print(payload)
+                    else:
+                        skipped += 1
                     continue
-
-            stats = compute_stats(session)
-            meta = session["metadata"]
-            ts = meta.get("first_timestamp", "")
-            if not ts:
-                from datetime import datetime as _dt
-                ts = _dt.fromtimestamp(sess_info["modified"]).strftime(
-                    "%Y-%m-%dT%H:%M:%S"
-                )
-                meta["first_timestamp"] = ts
-            date_str = ts[:10]
-            ts_file = ts[:19].replace(":", "-")   # 2026-02-10T01-46-15
-            title_slug = _slugify(session["title"])
-            short_id = sid[:8]
-            project_slug = _slugify(project["name"])
-
-            if fmt in ("md", "both"):
-                md = session_to_markdown(session, stats)
-                rel_path = os.path.join(
-                    date_str, project_slug, f"{ts_file}__{title_slug}__{short_id}.md"
-                )
-                all_exports.append((rel_path, md))
-
-            if fmt in ("json", "both"):
-                js = session_to_json(session, stats)
-                rel_path = os.path.join(
-                    date_str, project_slug, f"{ts_file}__{title_slug}__{short_id}.json"
-                )
-                all_exports.append((rel_path, js))
-
-            manifest.append({
-                "session_id": sid,
-                "title": session["title"],
-                "project": project["name"],
-                "updated_at": meta.get("last_timestamp", ""),
-                "models": meta.get("models_used", []),
-                "tokens": meta["total_input_tokens"] + meta["total_output_tokens"],
-                "tool_calls": meta["total_tool_calls"],
-                "files_touched": stats.get("files_touched", {}).get(
-                    "total_unique", 0
-                ),
-                "commands_run": len(stats.get("commands_run", [])),
-                "cost_estimate_usd": stats.get("cost_estimate_usd"),
-                "wall_clock_seconds": meta.get("session_wall_time_seconds"),
-            })
-
+                exports, manifest_entry, _, _ = payload
+                entry = _store_render(sess_info, exports, manifest_entry)
+            else:
+                exports = _load_render(sid, entry, fmt)
+            render_cache[sid] = entry
+            duplicate_of = None
+            for rel_path, content in exports:
+                duplicate_of = sink.write(rel_path, content) or duplicate_of
+            del exports
+            if duplicate_of:
+                manifest.append({**entry["manifest"], "duplicate_of": duplicate_of})
+            else:
+                manifest.append(entry["manifest"])
             last_export[sid] = sess_info["modified"]
+            # Loose files are final once written, so an interrupted run can
+            # pick up where it stopped. A zip without its central directory
+            # is unreadable, so zipped runs only save state at the end.
+            if no_zip and len(manifest) % _CHECKPOINT_EVERY == 0:
+                _save_state(
+                    last_export, count=len(manifest), out_dir=out_dir,
+                    cache={**old_cache, **render_cache}, rules_key=rules_key,
+                )
+        exported = sink.count
+        if exported:
+            location = sink.finish(manifest)
+
+    # Sessions this run didn't look at (other projects, or unchanged under
+    # --since last) keep their entries while the source file still exists.
+    for sid, entry in old_cache.items():
+        if os.path.isfile(entry.get("path", "")):
+            render_cache[sid] = entry
+        else:
+            _drop_render(sid)
 
-    exported = len(all_exports)
     print(
         f"Exporting {exported} file(s) "
         f"({skipped} skipped, {total_sessions} total)"
     )
 
-    if not all_exports:
+    if not exported:
         print("Nothing to export.")
         return
 
-    os.makedirs(out_dir, exist_ok=True)
+    print(f"Exported {exported} file(s) to {location}")
+
+    _save_state(
+        last_export, count=len(manifest), out_dir=out_dir,
+        cache=render_cache, rules_key=rules_key,
+    )
+    print(f"State saved to {STATE_FILE}")
 
-    if no_zip:
-        for rel_path, content in all_exports:
-            full_path = os.path.join(out_dir, rel_path)
-            os.makedirs(os.path.dirname(full_path), exist_ok=True)
-            with open(full_path, "w", encoding="utf-8") as f:
+
+def _dedupe_digest(rel_path: str, content: bytes) -> bytes:
+    """Digest of an export minus the parts that name its session: the
+    frontmatter and title header of a .md, everything before "messages" in
+    a .json. Every export carries its session id, so hashing the whole file
+    would never find two sessions alike."""
+    view = memoryview(content)
+    if rel_path.endswith(".md"):
+        start = 0
+        for _ in range(2):  # frontmatter, then the header under it
+            end = content.find(b"\n---\n", start)
+            if end == -1:
+                break
+            start = end + 5
+        view = view[start:]
+    elif rel_path.endswith(".json"):
+        start = content.find(b'"messages":')
+        if start != -1:
+            view = view[start:]
+    h = hashlib.blake2b(os.path.splitext(rel_path)[1].encode(), digest_size=16)
+    h.update(view)
+    return h.digest()
+
+
+class _ExportSink:
+    """Writes exports as they are produced, into a dated zip under *out_dir*
+    or as loose files when *no_zip*. Nothing is created on disk until the
+    first write, so an empty run leaves no zip behind. *compress_level* 0
+    stores entries uncompressed; 1-9 is the deflate level. With *dedupe*, a
+    file whose conversation matches an earlier one (see _dedupe_digest())
+    is replaced by a one-line pointer to it."""
+
+    def __init__(self, out_dir: str, no_zip: bool, compress_level: int = 3,
+                 dedupe: bool = False):
+        self.out_dir = out_dir
+        self.no_zip = no_zip
+        self.compress_level = compress_level
+        self._seen = {} if dedupe else None  # content digest -> first rel_path
+        self.count = 0
+        self._zf = None
+        self._raw = None
+        # Loose files land in a handful of date/project dirs; create each once.
+        self._dirs = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if self._zf is not None:
+            self._zf.close()
+            self._raw.close()
+
+    def write(self, rel_path: str, content: bytes) -> str | None:
+        """Write one export. Returns the earlier path it duplicates, if any."""
+        duplicate_of = None
+        if self._seen is not None:
+            digest = _dedupe_digest(rel_path, content)
+            duplicate_of = self._seen.get(digest)
+            if duplicate_of is None:
+                self._seen[digest] = rel_path
+            else:
+                content = f"> duplicate of {duplicate_of}\n".encode("utf-8")
+        if self.count == 0:
+            os.makedirs(self.out_dir, exist_ok=True)
+            if not self.no_zip:
+                if self.compress_level:
+                    compression, level = zipfile.ZIP_DEFLATED, self.compress_level
+                else:
+                    compression, level = zipfile.ZIP_STORED, None
+                # zipfile writes each compressed block straight through; a
+                # big buffer turns those into a few large writes.
+                self._raw = open(self._zip_path(), "wb", buffering=_WRITE_BUFFER)
+                self._zf = zipfile.ZipFile(
+                    self._raw, "w", compression, compresslevel=level
+                )
+        if self._zf is not None:
+            self._zf.writestr(rel_path, content)
+        else:
+            full_path = os.path.join(self.out_dir, rel_path)
+            parent = os.path.dirname(full_path)
+            if parent not in self._dirs:
+                os.makedirs(parent, exist_ok=True)
+                self._dirs.add(parent)
+            with open(full_path, "wb") as f:
                 f.write(content)
-        manifest_path = os.path.join(out_dir, "manifest.jsonl")
-        with open(manifest_path, "w", encoding="utf-8") as f:
-            for entry in manifest:
-                f.write(json.dumps(entry, default=str) + "\n")
-        print(f"Exported {exported} file(s) to {out_dir}")
-    else:
+        self.count += 1
+        return duplicate_of
+
+    def finish(self, manifest: list) -> str:
+        """Write manifest.jsonl last and return where the export went."""
+        if self._zf is None:
+            manifest_path = os.path.join(self.out_dir, "manifest.jsonl")
+            with open(manifest_path, "wb") as f:
+                f.write(b"".join(fastjson.dumps(e, default=str) + b"\n" for e in manifest))
+            return self.out_dir
+        self._zf.writestr(
+            "manifest.jsonl",
+            b"\n".join(fastjson.dumps(e, default=str) for e in manifest),
+        )
+        return self._raw.name
+
+    def _zip_path(self) -> str:
         date_tag = datetime.now().strftime("%Y-%m-%d")
-        zip_name = f"claude-code-export-{date_tag}.zip"
-        zip_path = os.path.join(out_dir, zip_name)
-        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
-            for rel_path, content in all_exports:
-                zf.writestr(rel_path, content)
-            manifest_str = "\n".join(
-                json.dumps(e, default=str) for e in manifest
-            )
-            zf.writestr("manifest.jsonl", manifest_str)
-        print(f"Exported {exported} file(s) to {zip_path}")
+        return os.path.join(self.out_dir, f"claude-code-export-{date_tag}.zip")
 
-    _save_state(last_export, count=len(manifest), out_dir=out_dir)
-    print(f"State saved to {STATE_FILE}")
 
+def _process_session(task: tuple) -> tuple:
+    """Worker for cmd_export: parse, filter and render one session.
 
-def _export_single(session: dict, stats: dict, fmt: str, out_dir: str):
-    """Write one session to disk as md, json, or both."""
+    Returns ``("ok", (exports, manifest_entry, sid, mtime))`` where exports
+    is a list of ``(rel_path, utf8_bytes)``, ``("skipped", None)`` for
+    untitled or excluded sessions, or ``("error", message)`` if parsing
+    failed. Content is encoded here so that work runs in the pool as well.
+    """
+    sess_info, project, fmt, matcher = task
+    sid = sess_info["id"]
+    try:
+        # Untitled sessions are never exported, so find the title cheaply
+        # before paying for a full parse.
+        title = quick_session_title_cached(sess_info["path"])
+        if title == "Untitled Session":
+            return "skipped", None
+        # The project name and title are a prefix of the full searchable
+        # text, so a hit here is final without parsing the session.
+        if matcher and matcher.matches(build_searchable_text(
+            project_name=project["display_name"],
+            session_title=title,
+        )):
+            return "skipped", None
+        session = parse_session_cached(sess_info["path"])
+    except Exception as e:
+        return "error", f"  Warning: failed to parse {sid}: {e}"
+
+    if matcher:
+        meta = session["metadata"]
+        parts = iter_searchable_parts(
+            project_name=project["display_name"],
+            session_title=session["title"],
+            model_names=meta.get("models_used"),
+            content_parts=_session_text_iter(session),
+        )
+        if matcher.matches_chunks(parts):
+            return "skipped", None
+
+    stats = compute_stats(session)
+    meta = session["metadata"]
+    ts = meta.get("first_timestamp", "")
+    if not ts:
+        ts = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(sess_info["modified"]))
+        # The parsed session is shared through the parse cache; patch a copy.
+        meta = {**meta, "first_timestamp": ts}
+        session = {**session, "metadata": meta}
+    date_str = ts[:10]
+    ts_file = ts[:19].replace(":", "-")   # 2026-02-10T01-46-15
     title_slug = _slugify(session["title"])
-    short_id = session["session_id"][:8]
-    ts = session["metadata"].get("first_timestamp", "")
-    ts_file = ts[:19].replace(":", "-") if ts else "0000-00-00T00-00-00"
+    short_id = sid[:8]
+    project_slug = project["slug"]
 
-    files = []
+    exports = []
     if fmt in ("md", "both"):
         md = session_to_markdown(session, stats)
-        files.append((f"{ts_file}__{title_slug}__{short_id}.md", md))
+        rel_path = os.path.join(
+            date_str, project_slug, f"{ts_file}__{title_slug}__{short_id}.md"
+        )
+        exports.append((rel_path, md.encode("utf-8")))
+
     if fmt in ("json", "both"):
         js = session_to_json(session, stats)
-        files.append((f"{ts_file}__{title_slug}__{short_id}.json", js))
+        rel_path = os.path.join(
+            date_str, project_slug, f"{ts_file}__{title_slug}__{short_id}.json"
+        )
+        exports.append((rel_path, js.encode("utf-8")))
+
+    manifest_entry = {
+        "session_id": sid,
+        "title": session["title"],
+        "project": project["name"],
+        "updated_at": meta.get("last_timestamp", ""),
+        "models": meta.get("models_used", []),
+        "tokens": meta["total_input_tokens"] + meta["total_output_tokens"],
+        "tool_calls": meta["total_tool_calls"],
+        "files_touched": stats.get("files_touched", {}).get(
+            "total_unique", 0
+        ),
+        "commands_run": len(stats.get("commands_run", [])),
+        "cost_estimate_usd": stats.get("cost_estimate_usd"),
+        "wall_clock_seconds": meta.get("session_wall_time_seconds"),
+    }
+    return "ok", (exports, manifest_entry, sid, sess_info["modified"])
+
+
+def _export_single(session: dict, stats: dict, fmt: str, out_dir: str):
+    """Write one session to disk as md, json, or both."""
+    title_slug = _slugify(session["title"])
+    short_id = session["session_id"][:8]
+    ts = session["metadata"].get("first_timestamp", "")
+    ts_file = ts[:19].replace(":", "-") if ts else "0000-00-00T00-00-00"
 
+    base_name = f"{ts_file}__{title_slug}__{short_id}"
     os.makedirs(out_dir, exist_ok=True)
-    for fname, content in files:
-        fpath = os.path.join(out_dir, fname)
+    if fmt in ("md", "both"):
+        fpath = os.path.join(out_dir, base_name + ".md")
         with open(fpath, "w", encoding="utf-8") as f:
-            f.write(content)
+            f.write(session_to_markdown(session, stats))
+        print(f"Exported: {fpath}")
+    if fmt in ("json", "both"):
+        fpath = os.path.join(out_dir, base_name + ".json")
+        with open(fpath, "wb") as f:
+            dump_session(session, f, stats)
         print(f"Exported: {fpath}")
 
 
 # ==================== Helpers ====================
 
 
-def _session_text_for_exclusion(session: dict) -> str:
-    """Extract plain text from all session messages for exclusion rule matching."""
-    parts = []
+def _enumerate_all(base_dir: str, project_filter: str | None = None) -> list:
+    """``(project, sessions)`` for every project under *base_dir* matching
+    *project_filter*, shared by export and stats.
+
+    The project list costs a file read per project for its display name, so
+    it's kept for the life of the process while *base_dir*'s mtime holds
+    (new project dirs bump it). Session lists are always re-read: appends to
+    a session don't touch any directory mtime.
+    """
+    projects = _list_projects_cached(
+        base_dir, project_filter, os.stat(base_dir).st_mtime_ns
+    )
+    return [(project, list_sessions(project["path"])) for project in projects]
+
+
+@functools.lru_cache(maxsize=4)
+def _list_projects_cached(base_dir: str, project_filter: str | None, mtime_ns: int) -> tuple:
+    return tuple(list_projects(base_dir, name_filter=project_filter))
+
+
+# How many session files ahead of the one being consumed to ask the kernel
+# to start reading, when running in-process.
+_READAHEAD = 32
+
+# Chunks queued per worker at a time on the pool path.
+_CHUNKS_IN_FLIGHT = 2
+
+
+def _parallel_map(fn, tasks: list, chunksize: int = 16, paths: list[str] | None = None):
+    """map() *fn* over *tasks* in worker processes, yielding results in task
+    order. Parsing and rendering are CPU-bound, so this scales with cores;
+    small runs (or single-core machines) stay in-process, where pool
+    start-up would cost more than it saves.
+
+    *paths*, if given, are the files the tasks will read, in task order;
+    they're read ahead of the workers (see _read_ahead) so a cold run
+    overlaps disk reads with parsing.
+    """
+    workers = min(os.cpu_count() or 1, -(-len(tasks) // chunksize))
+    if not paths or not hasattr(os, "posix_fadvise"):
+        paths = ()
+    if workers <= 1:
+        for path in paths[:_READAHEAD]:
+            _read_ahead(path)
+        for i, result in enumerate(map(fn, tasks), _READAHEAD):
+            if i < len(paths):
+                _read_ahead(paths[i])
+            yield result
+        return
+
+    # Workers run ahead of the consumer, so the hints follow the queue
+    # instead: chunks go out a few per worker at a time, and each chunk's
+    # files are hinted as it is queued.
+    starts = iter(range(0, len(tasks), chunksize))
+    pending = deque()
+    executor = ProcessPoolExecutor(max_workers=workers)
+
+    def submit_next():
+        start = next(starts, None)
+        if start is None:
+            return
+        end = start + chunksize
+        for path in paths[start:end]:
+            _read_ahead(path)
+        pending.append(executor.submit(_map_chunk, fn, tasks[start:end]))
+
+    try:
+        for _ in range(workers * _CHUNKS_IN_FLIGHT):
+            submit_next()
+        while pending:
+            results = pending.popleft().result()
+            submit_next()
+            yield from results
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def _map_chunk(fn, chunk: list) -> list:
+    """One pool task for _parallel_map(): *fn* over a chunk of its tasks."""
+    return [fn(task) for task in chunk]
+
+
+def _read_ahead(path: str):
+    """Hint the kernel to start reading *path* into the page cache in the
+    background (POSIX_FADV_WILLNEED returns without waiting for the I/O)."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _session_text_iter(session: dict) -> Iterator[str]:
+    """Yield the plain text of each session message for exclusion rule
+    matching, so a match can stop early without joining the transcript."""
     for msg in session.get("messages", []):
         text = msg.get("text") or ""
         if isinstance(text, str) and text.strip():
-            parts.append(text)
-    return "\n\n".join(parts)
+            yield text
 
 
 # ==================== Argument Parser ====================
@@ -507,6 +923,12 @@ def build_parser() -> argparse.ArgumentParser:
                         default=None, help="Export format (default: md)")
     parser.add_argument("--session", default=None,
                         help="Export/stats for single session (UUID prefix)")
+    parser.add_argument("--compress-level", type=_compress_level, default=None,
+                        metavar="N", help="Zip deflate level 0-9, 0 = store (default: 3)")
+    parser.add_argument("--store", dest="compress_level", action="store_const", const=0,
+                        help="Store zip entries uncompressed (same as --compress-level 0)")
+    parser.add_argument("--dedupe", action="store_true", default=False,
+                        help="Replace sessions whose conversation matches an earlier one with a pointer to it")
     parser.add_argument(
         "--exclude-rules", "-e",
         default=None,
@@ -524,6 +946,8 @@ def build_parser() -> argparse.ArgumentParser:
                         help="Filter/select project")
     list_p.add_argument("--base-dir", default=None,
                         help="Override Claude Code projects directory")
+    list_p.add_argument("--limit", type=int, default=None,
+                        help="Show only the N most recently modified entries")
 
     # Stats subcommand
     stats_p = subparsers.add_parser("stats", help="Show statistics")
@@ -535,6 +959,8 @@ def build_parser() -> argparse.ArgumentParser:
                          help="Filter by project name")
     stats_p.add_argument("--base-dir", default=None,
                          help="Override Claude Code projects directory")
+    stats_p.add_argument("--no-cache", action="store_true",
+                         help="Ignore and don't update the stats cache")
 
     # Export subcommand (explicit)
     export_p = subparsers.add_parser("export", help="Export sessions")
@@ -548,6 +974,12 @@ def build_parser() -> argparse.ArgumentParser:
                           default="md", help="Export format (default: md)")
     export_p.add_argument("--session", default=None,
                           help="Export single session by UUID prefix")
+    export_p.add_argument("--compress-level", type=_compress_level, default=None,
+                          metavar="N", help="Zip deflate level 0-9, 0 = store (default: 3)")
+    export_p.add_argument("--store", dest="compress_level", action="store_const", const=0,
+                          help="Store zip entries uncompressed (same as --compress-level 0)")
+    export_p.add_argument("--dedupe", action="store_true",
+                          help="Replace sessions whose conversation matches an earlier one with a pointer to it")
     export_p.add_argument("--project", default=None,
                           help="Filter by project name")
     export_p.add_argument("--base-dir", default=None,
@@ -564,26 +996,92 @@ def build_parser() -> argparse.ArgumentParser:
     return parser
 
 
+def _compress_level(value: str) -> int:
+    if not value.isdigit() or not 0 <= int(value) <= 9:
+        raise argparse.ArgumentTypeError(f"must be an integer from 0 to 9, got {value!r}")
+    return int(value)
+
+
 def _find_session(session_id: str, base_dir: str) -> str | None:
-    """Scan all projects for a session matching this UUID (or prefix).
+    """Find the session matching this UUID (or prefix) via the session index.
     Fails if the prefix matches more than one session."""
+    if not os.path.isdir(base_dir):
+        return None
+    path = _match_session(session_id, _session_index(base_dir))
+    if path is None or not os.path.isfile(path):
+        # Directory mtimes can be coarse, so a miss may just mean the index
+        # is stale: rebuild it from scratch before giving up.
+        path = _match_session(session_id, _session_index(base_dir, rebuild=True))
+    return path
+
+
+def _match_session(session_id: str, projects: dict) -> str | None:
     matches = []
-    for project in list_projects(base_dir):
-        for s in list_sessions(project["path"]):
-            if s["id"] == session_id:
-                return s["path"]
-            if s["id"].startswith(session_id):
-                matches.append(s)
+    for project_dir in sorted(projects):
+        for sid, fname in projects[project_dir]["sessions"].items():
+            if sid == session_id:
+                return os.path.join(project_dir, fname)
+            if sid.startswith(session_id):
+                matches.append((sid, os.path.join(project_dir, fname)))
     if len(matches) == 1:
-        return matches[0]["path"]
+        return matches[0][1]
     if len(matches) > 1:
         _die(
             f"Ambiguous prefix '{session_id}' matches {len(matches)} sessions:\n"
-            + "\n".join(f"  {m['id']}" for m in matches)
+            + "\n".join(f"  {sid}" for sid, _ in matches)
         )
     return None
 
 
+def _session_index(base_dir: str, rebuild: bool = False) -> dict:
+    """Map each project dir under *base_dir* to its mtime and session files.
+
+    Persisted in STATE_DIR/session_index.json. Adding or removing a session
+    file bumps its project dir's mtime, so only projects whose mtime moved
+    are re-listed; the rest cost one stat each.
+    """
+    index_path = os.path.join(STATE_DIR, "session_index.json")
+    cached = {}
+    if not rebuild:
+        try:
+            with open(index_path, "rb") as f:
+                data = fastjson.loads(f.read())
+            if data.get("base") == base_dir:
+                cached = data.get("projects", {})
+        except (OSError, ValueError):
+            pass
+
+    projects = {}
+    changed = rebuild
+    with os.scandir(base_dir) as it:
+        for entry in it:
+            if not entry.is_dir():
+                continue
+            mtime_ns = entry.stat().st_mtime_ns
+            prev = cached.get(entry.path)
+            if prev and prev.get("mtime_ns") == mtime_ns:
+                projects[entry.path] = prev
+                continue
+            projects[entry.path] = {
+                "mtime_ns": mtime_ns,
+                "sessions": {
+                    fname.replace(".jsonl", ""): fname
+                    for fname in sorted(os.listdir(entry.path))
+                    if fname.endswith(".jsonl")
+                },
+            }
+            changed = True
+
+    if changed or projects.keys() != cached.keys():
+        try:
+            os.makedirs(STATE_DIR, exist_ok=True)
+            with open(index_path, "wb") as f:
+                f.write(fastjson.dumps({"base": base_dir, "projects": projects}))
+        except OSError:
+            pass
+    return projects
+
+
 def _load_state() -> dict:
     """Load export state, migrating legacy flat format to the current schema.
 
@@ -602,8 +1100,8 @@ def _load_state() -> dict:
     """
     if not os.path.isfile(STATE_FILE):
         return {}
-    with open(STATE_FILE, "r") as f:
-        data = json.load(f)
+    with open(STATE_FILE, "rb") as f:
+        data = fastjson.loads(f.read())
     # Migrate: if the file has neither "sessions" nor "lastExportTime" it is
     # the old flat dict of session_id → mtime.
     if "sessions" not in data and "lastExportTime" not in data:
@@ -611,8 +1109,13 @@ def _load_state() -> dict:
     return data
 
 
-def _save_state(sessions: dict, count: int, out_dir: str):
-    """Persist export state with standardised fields matching cursor-chat-browser."""
+def _save_state(sessions: dict, count: int, out_dir: str,
+                cache: dict | None = None, rules_key: str | None = None):
+    """Persist export state with standardised fields matching cursor-chat-browser.
+
+    *cache* and *rules_key* are the render cache from cmd_export; they are
+    only written when given.
+    """
     os.makedirs(STATE_DIR, exist_ok=True)
     state = {
         "lastExportTime": datetime.now().isoformat(),
@@ -620,20 +1123,94 @@ def _save_state(sessions: dict, count: int, out_dir: str):
         "exportDir": out_dir,
         "sessions": sessions,
     }
-    with open(STATE_FILE, "w") as f:
-        json.dump(state, f, indent=2)
+    if cache is not None:
+        state["rulesKey"] = rules_key
+        state["cache"] = cache
+    # Write-then-rename, so a crash mid-write never leaves a torn state file.
+    tmp = STATE_FILE + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(fastjson.dumps(state))
+    os.replace(tmp, STATE_FILE)
+
+
+def _render_cache_file(sid: str, ext: str) -> str:
+    return os.path.join(STATE_DIR, "render-cache", f"{sid}.{ext}")
+
+
+def _render_cache_hit(entry: dict | None, sess_info: dict, fmt: str) -> dict | None:
+    """Return *entry* if it still describes this session file and has every
+    format we need on disk, else None."""
+    if (
+        not entry
+        or entry.get("mtime") != sess_info["modified"]
+        or entry.get("size") != sess_info["size_bytes"]
+    ):
+        return None
+    paths = entry.get("exports", {})
+    for ext in _FORMAT_EXTS[fmt]:
+        if ext not in paths or not os.path.isfile(_render_cache_file(sess_info["id"], ext)):
+            return None
+    return entry
+
+
+def _store_render(sess_info: dict, exports: list, manifest_entry: dict) -> dict:
+    """Save freshly rendered exports to the render cache and return the entry."""
+    sid = sess_info["id"]
+    paths = {}
+    os.makedirs(os.path.join(STATE_DIR, "render-cache"), exist_ok=True)
+    for rel_path, content in exports:
+        ext = rel_path.rsplit(".", 1)[1]
+        with open(_render_cache_file(sid, ext), "wb") as f:
+            f.write(content)
+        paths[ext] = rel_path
+    return {
+        "path": sess_info["path"],
+        "mtime": sess_info["modified"],
+        "size": sess_info["size_bytes"],
+        "manifest": manifest_entry,
+        "exports": paths,
+    }
 
 
-def _slugify(text: str) -> str:
-    slug = ""
-    for c in text.lower():
+def _load_render(sid: str, entry: dict, fmt: str) -> list:
+    exports = []
+    for ext in _FORMAT_EXTS[fmt]:
+        with open(_render_cache_file(sid, ext), "rb") as f:
+            exports.append((entry["exports"][ext], f.read()))
+    return exports
+
+
+def _drop_render(sid: str):
+    for ext in ("md", "json"):
+        try:
+            os.remove(_render_cache_file(sid, ext))
+        except OSError:
+            pass
+
+
+class _SlugTable(dict):
+    """str.translate() table for _slugify: alphanumerics map to themselves,
+    separators to "-", everything else is dropped. Filled in lazily per code
+    point, so only characters that actually occur in titles are stored."""
+
+    def __missing__(self, cp: int) -> str | None:
+        c = chr(cp)
         if c.isalnum():
-            slug += c
+            value = c
         elif c in " -_/.":
-            slug += "-"
-    while "--" in slug:
-        slug = slug.replace("--", "-")
-    return slug.strip("-")
+            value = "-"
+        else:
+            value = None
+        self[cp] = value
+        return value
+
+
+_SLUG_TABLE = _SlugTable()
+_DASH_RUN = re.compile(r"-{2,}")
+
+
+def _slugify(text: str) -> str:
+    return _DASH_RUN.sub("-", text.lower().translate(_SLUG_TABLE)).strip("-")
 
 
 def _die(msg: str):
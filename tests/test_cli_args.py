@@ -166,6 +166,15 @@ class TestExportParserFlags:
         args = self._parse(["export"])
         assert args.command == "export"
 
+    def test_store_means_compress_level_zero(self):
+        assert self._parse(["export", "--store"]).compress_level == 0
+        assert self._parse(["--store"]).compress_level == 0
+        assert self._parse(["export"]).compress_level is None
+
+    def test_dedupe_flag(self):
+        assert self._parse(["export", "--dedupe"]).dedupe is True
+        assert self._parse(["export"]).dedupe is False
+
     # -- --help does not raise (just exits 0) -----------------------------------
 
     def test_help_exits_zero(self):
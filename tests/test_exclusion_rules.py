@@ -0,0 +1,155 @@
+"""
+Unit tests for utils/exclusion_rules.py.
+
+The compiled ExclusionMatcher must agree with the reference evaluator
+(is_excluded_by_rules) for every rule shape the rule file syntax allows.
+
+Run:
+    pytest tests/test_exclusion_rules.py -v
+"""
+
+import os
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import utils.exclusion_rules as exclusion_rules
+from utils.exclusion_rules import (
+    Rule,
+    _parse_rule,
+    _tokenize_rule,
+    build_searchable_text,
+    compile_rules,
+    is_excluded_by_rules,
+    is_excluded_by_rules_chunks,
+    iter_searchable_parts,
+)
+
+
+RULE_LINES = [
+    "secret",
+    "secret OR internal",
+    '"project alpha" AND confidential',
+    "alpha beta",
+    "a OR b AND c",
+    '"unterminated phrase',
+    '""',
+]
+
+TEXTS = [
+    "",
+    "nothing to see here",
+    "Top SECRET plans",
+    "an Internal memo",
+    "Project Alpha is confidential",
+    "project alpha only",
+    "confidential only",
+    "alpha and beta",
+    "beta",
+    "a",
+    "b and c",
+    "b only",
+    "unterminated phrase inside",
+]
+
+
+def _rules(*lines):
+    return [_parse_rule(line) for line in lines]
+
+
+class TestCompileRules:
+    @pytest.mark.parametrize("line", RULE_LINES)
+    @pytest.mark.parametrize("text", TEXTS)
+    def test_matcher_agrees_with_reference(self, line, text):
+        rules = _rules(line)
+        matcher = compile_rules(rules)
+        assert bool(matcher and matcher.matches(text)) == is_excluded_by_rules(rules, text)
+
+    def test_all_rules_combined(self):
+        rules = _rules(*RULE_LINES)
+        matcher = compile_rules(rules)
+        for text in TEXTS:
+            assert matcher.matches(text) == is_excluded_by_rules(rules, text)
+
+    def test_terms_are_lowercased_once(self):
+        assert _tokenize_rule('Secret AND "Project Alpha"') == [
+            ("word", "secret"), "AND", ("phrase", "project alpha"),
+        ]
+
+    def test_rule_packs_clauses(self):
+        assert _parse_rule('A OR b AND "C d" OR ""') == Rule((("a",), ("b", "c d")))
+
+    def test_load_rules_returns_rules(self, tmp_path):
+        path = tmp_path / "rules.txt"
+        path.write_text('# comment\n\nsecret OR internal\n""\n', encoding="utf-8")
+        assert exclusion_rules.load_rules(str(path)) == [Rule((("secret",), ("internal",)))]
+
+    def test_empty_rules_are_falsy(self):
+        assert not compile_rules([])
+        assert not compile_rules(_rules('""'))
+
+    def test_overlapping_terms(self):
+        matcher = compile_rules(_rules("ab OR b"))
+        assert matcher.matches("xab")
+        assert matcher.matches("xb")
+
+
+class TestChunkedMatching:
+    PARTS = {
+        "project_name": "proj-alpha",
+        "session_title": "Confidential review",
+        "model_names": ["claude-opus"],
+        "content_parts": ["first message mentions project alpha", "", None, "b and c"],
+    }
+
+    @pytest.mark.parametrize("line", RULE_LINES + ["opus AND review", "alpha AND missing"])
+    def test_chunks_agree_with_joined_text(self, line):
+        rules = _rules(line)
+        joined = build_searchable_text(
+            project_name=self.PARTS["project_name"],
+            session_title=self.PARTS["session_title"],
+            model_names=self.PARTS["model_names"],
+            content_snippet="\n\n".join(p for p in self.PARTS["content_parts"] if p),
+        )
+        chunked = is_excluded_by_rules_chunks(rules, iter_searchable_parts(**self.PARTS))
+        assert chunked == is_excluded_by_rules(rules, joined)
+
+    def test_and_clause_spans_chunks(self):
+        matcher = compile_rules(_rules("alpha AND beta"))
+        assert matcher.matches_chunks(["Alpha", "BETA"])
+        assert not matcher.matches_chunks(["alpha", "gamma"])
+
+    def test_stops_at_first_match(self):
+        consumed = []
+
+        def chunks():
+            for c in ("nothing", "secret", "never read"):
+                consumed.append(c)
+                yield c
+
+        assert compile_rules(_rules("secret")).matches_chunks(chunks())
+        assert consumed == ["nothing", "secret"]
+
+
+class TestAutomatonMatching:
+    @pytest.fixture(autouse=True)
+    def _force_automaton(self, monkeypatch):
+        pytest.importorskip("ahocorasick")
+        monkeypatch.setattr(exclusion_rules, "_AUTOMATON_MIN_TERMS", 1)
+
+    @pytest.mark.parametrize("line", RULE_LINES + ["ab OR b", "opus AND review"])
+    def test_agrees_with_reference(self, line):
+        rules = _rules(line)
+        matcher = compile_rules(rules)
+        assert matcher._automaton is not None or not matcher
+        for text in TEXTS + ["xab", "claude-opus\nreview"]:
+            assert bool(matcher and matcher.matches(text)) == is_excluded_by_rules(rules, text)
+
+    def test_and_clause_spans_chunks(self):
+        matcher = compile_rules(_rules("alpha AND beta", "secret"))
+        assert matcher.matches_chunks(["Alpha", "BETA"])
+        assert not matcher.matches_chunks(["alpha", "gamma"])
+        assert matcher.matches_chunks(["gamma", "top SECRET"])
@@ -87,11 +87,14 @@ def _run_export(
         cmd += ["--exclude-rules", str(rules_path)]
     if extra_args:
         cmd += extra_args
+    # A private HOME keeps the export state and render cache out of the
+    # developer's real ~/.claude-code-chat-browser.
     return subprocess.run(
         cmd,
         cwd=str(REPO_ROOT),
         capture_output=True,
         text=True,
+        env={**os.environ, "HOME": str(out_dir.parent)},
     )
 
 
@@ -162,7 +165,10 @@ class TestExclusionRulesFiltering:
             "--out", str(out_dir),
             "-e", str(rules_file),
         ]
-        proc = subprocess.run(cmd, cwd=str(REPO_ROOT), capture_output=True, text=True)
+        proc = subprocess.run(
+            cmd, cwd=str(REPO_ROOT), capture_output=True, text=True,
+            env={**os.environ, "HOME": str(tmp_path)},
+        )
         assert proc.returncode == 0, proc.stderr
 
         md_files = _collect_md(out_dir)
@@ -249,7 +255,10 @@ class TestExclusionRulesFiltering:
             "--out", str(out_dir),
             "--exclude-rules", str(rules_file),
         ]
-        proc = subprocess.run(cmd, cwd=str(REPO_ROOT), capture_output=True, text=True)
+        proc = subprocess.run(
+            cmd, cwd=str(REPO_ROOT), capture_output=True, text=True,
+            env={**os.environ, "HOME": str(tmp_path)},
+        )
         assert proc.returncode == 0, proc.stderr
         assert len(_collect_md(out_dir)) == 0
 
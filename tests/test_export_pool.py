@@ -0,0 +1,84 @@
+"""Bulk export (/api/export) renders small exports in-process and big ones
+on the shared module-level pool, with the same zip either way.
+
+Run: pytest tests/test_export_pool.py -v
+"""
+
+import io
+import json
+import os
+import sys
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import api.export_api as export_api
+from app import create_app
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _corpus(tmp_path, n):
+    project = tmp_path / "projects" / "-home-u-app"
+    project.mkdir(parents=True)
+    for i in range(n):
+        (project / f"s{i:03d}.jsonl").write_text(json.dumps({
+            "type": "user", "timestamp": "2026-01-01T00:00:00Z",
+            "message": {"content": f"hello {i}"},
+        }) + "\n")
+    return str(tmp_path / "projects")
+
+
+def _export(base):
+    client = create_app(base_dir=base, search_index=False).test_client()
+    resp = client.post("/api/export", json={})
+    assert resp.status_code == 200
+    return sorted(zipfile.ZipFile(io.BytesIO(resp.data)).namelist())
+
+
+@pytest.fixture(autouse=True)
+def _private_state(tmp_path, monkeypatch):
+    monkeypatch.setattr(export_api, "_STATE_FILE", str(tmp_path / "export_state.json"))
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+class TestExportPool:
+    def test_small_export_stays_in_process(self, tmp_path, monkeypatch):
+        def no_pool():
+            raise AssertionError("pool started for a small export")
+
+        monkeypatch.setattr(export_api, "_get_export_pool", no_pool)
+        names = _export(_corpus(tmp_path, 3))
+        assert len(names) == 4 and "manifest.jsonl" in names
+
+    def test_big_export_uses_shared_pool(self, tmp_path, monkeypatch):
+        pool = ThreadPoolExecutor(max_workers=2)
+        calls = []
+        monkeypatch.setattr(export_api, "_get_export_pool", lambda: calls.append(1) or pool)
+        base = _corpus(tmp_path, export_api._IN_PROCESS_MAX_TASKS)
+        first = _export(base)
+        second = _export(base)
+        pool.shutdown()
+        assert calls == [1, 1]
+        assert first == second and len(first) == export_api._IN_PROCESS_MAX_TASKS + 1
+
+    def test_pool_workers_skip_the_parse_caches(self, tmp_path, monkeypatch):
+        def cached(*a, **kw):
+            raise AssertionError("pool worker used a parse cache")
+
+        pool = ThreadPoolExecutor(max_workers=2)
+        monkeypatch.setattr(export_api, "_get_export_pool", lambda: pool)
+        monkeypatch.setattr(export_api, "parse_session_cached", cached)
+        monkeypatch.setattr(export_api, "quick_session_title_cached", cached)
+        names = _export(_corpus(tmp_path, export_api._IN_PROCESS_MAX_TASKS))
+        pool.shutdown()
+        assert len(names) == export_api._IN_PROCESS_MAX_TASKS + 1
@@ -21,7 +21,7 @@ import pytest
 REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, REPO_ROOT)
 
-# Patch STATE_FILE before importing the module so we don't touch the real one.
+# The state_file fixture below keeps tests off the real state file.
 import scripts.export as _export_mod
 
 
@@ -29,11 +29,12 @@ import scripts.export as _export_mod
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _tmp_state_file(tmp_path):
-    """Return a temporary state file path and patch the module to use it."""
+@pytest.fixture
+def state_file(tmp_path, monkeypatch):
+    """Point the module's state file into *tmp_path*; undone after the test."""
     path = str(tmp_path / "export_state.json")
-    _export_mod.STATE_FILE = path
-    _export_mod.STATE_DIR = str(tmp_path)
+    monkeypatch.setattr(_export_mod, "STATE_FILE", path)
+    monkeypatch.setattr(_export_mod, "STATE_DIR", str(tmp_path))
     return path
 
 
@@ -42,56 +43,50 @@ def _tmp_state_file(tmp_path):
 # ---------------------------------------------------------------------------
 
 class TestSaveState:
-    def test_writes_last_export_time(self, tmp_path):
-        _tmp_state_file(tmp_path)
+    def test_writes_last_export_time(self, state_file):
         before = datetime.now()
         _export_mod._save_state(sessions={}, count=0, out_dir="/tmp/out")
         after = datetime.now()
 
-        with open(_export_mod.STATE_FILE) as f:
+        with open(state_file) as f:
             state = json.load(f)
 
         assert "lastExportTime" in state
         ts = datetime.fromisoformat(state["lastExportTime"])
         assert before <= ts <= after
 
-    def test_writes_exported_count(self, tmp_path):
-        _tmp_state_file(tmp_path)
+    def test_writes_exported_count(self, state_file):
         _export_mod._save_state(sessions={}, count=17, out_dir="/tmp/out")
-        with open(_export_mod.STATE_FILE) as f:
+        with open(state_file) as f:
             state = json.load(f)
         assert state["exportedCount"] == 17
 
-    def test_writes_export_dir(self, tmp_path):
-        _tmp_state_file(tmp_path)
+    def test_writes_export_dir(self, state_file):
         _export_mod._save_state(sessions={}, count=0, out_dir="/custom/export/path")
-        with open(_export_mod.STATE_FILE) as f:
+        with open(state_file) as f:
             state = json.load(f)
         assert state["exportDir"] == "/custom/export/path"
 
-    def test_writes_sessions_sub_key(self, tmp_path):
-        _tmp_state_file(tmp_path)
+    def test_writes_sessions_sub_key(self, state_file):
         sessions = {"uuid-aaa": 1740000000.0, "uuid-bbb": 1740001000.0}
         _export_mod._save_state(sessions=sessions, count=2, out_dir="/tmp")
-        with open(_export_mod.STATE_FILE) as f:
+        with open(state_file) as f:
             state = json.load(f)
         assert state["sessions"] == sessions
 
-    def test_all_cursor_keys_present(self, tmp_path):
+    def test_all_cursor_keys_present(self, state_file):
         """Every key that cursor-chat-browser stores must also appear here."""
-        _tmp_state_file(tmp_path)
         _export_mod._save_state(sessions={}, count=5, out_dir="/tmp/exports")
-        with open(_export_mod.STATE_FILE) as f:
+        with open(state_file) as f:
             state = json.load(f)
         for key in ("lastExportTime", "exportedCount", "exportDir"):
             assert key in state, f"Missing cursor-parity key: {key}"
 
-    def test_sessions_not_at_top_level(self, tmp_path):
+    def test_sessions_not_at_top_level(self, state_file):
         """Session UUIDs must be nested under 'sessions', not at top level."""
-        _tmp_state_file(tmp_path)
         sessions = {"some-uuid-123": 1740000000.0}
         _export_mod._save_state(sessions=sessions, count=1, out_dir="/tmp")
-        with open(_export_mod.STATE_FILE) as f:
+        with open(state_file) as f:
             state = json.load(f)
         # The UUID must not be a top-level key
         assert "some-uuid-123" not in state
@@ -103,20 +98,18 @@ class TestSaveState:
 # ---------------------------------------------------------------------------
 
 class TestLoadState:
-    def test_returns_empty_dict_when_no_file(self, tmp_path):
-        _tmp_state_file(tmp_path)
+    def test_returns_empty_dict_when_no_file(self, state_file):
         result = _export_mod._load_state()
         assert result == {}
 
-    def test_reads_current_format(self, tmp_path):
-        _tmp_state_file(tmp_path)
+    def test_reads_current_format(self, state_file):
         saved = {
             "lastExportTime": "2026-02-25T12:00:00",
             "exportedCount": 3,
             "exportDir": "/tmp/exports",
             "sessions": {"uuid-x": 1740000000.0},
         }
-        with open(_export_mod.STATE_FILE, "w") as f:
+        with open(state_file, "w") as f:
             json.dump(saved, f)
 
         result = _export_mod._load_state()
@@ -125,11 +118,10 @@ class TestLoadState:
         assert result["exportDir"] == "/tmp/exports"
         assert result["sessions"] == {"uuid-x": 1740000000.0}
 
-    def test_migrates_legacy_flat_format(self, tmp_path):
+    def test_migrates_legacy_flat_format(self, state_file):
         """Old state files that are flat dicts of session_id→mtime are migrated."""
-        _tmp_state_file(tmp_path)
         legacy = {"uuid-1": 1740000000.0, "uuid-2": 1740001000.0}
-        with open(_export_mod.STATE_FILE, "w") as f:
+        with open(state_file, "w") as f:
             json.dump(legacy, f)
 
         result = _export_mod._load_state()
@@ -140,22 +132,20 @@ class TestLoadState:
         assert "uuid-1" not in result
         assert "uuid-2" not in result
 
-    def test_migration_does_not_overwrite_file(self, tmp_path):
+    def test_migration_does_not_overwrite_file(self, state_file):
         """_load_state is read-only; it must not modify the file on disk."""
-        _tmp_state_file(tmp_path)
         legacy = {"uuid-1": 1740000000.0}
-        with open(_export_mod.STATE_FILE, "w") as f:
+        with open(state_file, "w") as f:
             json.dump(legacy, f)
 
         _export_mod._load_state()
 
-        with open(_export_mod.STATE_FILE) as f:
+        with open(state_file) as f:
             on_disk = json.load(f)
         # File unchanged after load
         assert on_disk == legacy
 
-    def test_roundtrip_save_then_load(self, tmp_path):
-        _tmp_state_file(tmp_path)
+    def test_roundtrip_save_then_load(self, state_file):
         sessions = {"sess-abc": 1740010000.0}
         _export_mod._save_state(sessions=sessions, count=1, out_dir="/roundtrip")
         loaded = _export_mod._load_state()
@@ -172,8 +162,7 @@ class TestLoadState:
 class TestSinceLastFiltering:
     """Verify the since-last flow: save state, reload, new session skipped."""
 
-    def test_session_skipped_after_save(self, tmp_path):
-        _tmp_state_file(tmp_path)
+    def test_session_skipped_after_save(self, state_file):
         mtime = 1740000000.0
         _export_mod._save_state(
             sessions={"sess-known": mtime}, count=1, out_dir="/tmp"
@@ -185,8 +174,7 @@ class TestSinceLastFiltering:
         # A session whose mtime has NOT changed since the save should be skipped
         assert last_export.get("sess-known", 0) >= mtime
 
-    def test_new_session_not_in_state(self, tmp_path):
-        _tmp_state_file(tmp_path)
+    def test_new_session_not_in_state(self, state_file):
         _export_mod._save_state(sessions={}, count=0, out_dir="/tmp")
 
         state = _export_mod._load_state()
@@ -194,3 +182,174 @@ class TestSinceLastFiltering:
 
         # A brand-new session has no entry → prev_mtime = 0 → will be exported
         assert last_export.get("brand-new-session", 0) == 0
+
+
+# ---------------------------------------------------------------------------
+# Render cache
+# ---------------------------------------------------------------------------
+
+class TestRenderCache:
+    """Unchanged sessions are re-emitted from the render cache, not re-parsed."""
+
+    def _export(self, base, out):
+        args = type("Args", (), {
+            "base_dir": str(base), "out": str(out), "since": None, "no_zip": True,
+            "project": None, "format": "both", "session": None, "exclude_rules": None,
+        })
+        _export_mod.cmd_export(args)
+
+    def test_only_changed_sessions_are_rendered(self, tmp_path, state_file, monkeypatch):
+        project = tmp_path / "projects" / "-home-u-app"
+        project.mkdir(parents=True)
+        for sid in ("s0", "s1"):
+            (project / f"{sid}.jsonl").write_text(json.dumps({
+                "type": "user", "timestamp": "2026-01-01T00:00:00Z",
+                "message": {"content": f"hello {sid}"},
+            }) + "\n")
+        self._export(tmp_path / "projects", tmp_path / "out1")
+
+        rendered = []
+        real = _export_mod._process_session
+        monkeypatch.setattr(
+            _export_mod, "_process_session", lambda t: (rendered.append(t[0]["id"]), real(t))[1]
+        )
+        os.utime(project / "s1.jsonl", (1, 1_000_000_000))
+        self._export(tmp_path / "projects", tmp_path / "out2")
+
+        assert rendered == ["s1"]
+        files1 = sorted(p.relative_to(tmp_path / "out1") for p in (tmp_path / "out1").rglob("*.md"))
+        files2 = sorted(p.relative_to(tmp_path / "out2") for p in (tmp_path / "out2").rglob("*.md"))
+        assert files1 == files2 and len(files2) == 2
+
+
+# ---------------------------------------------------------------------------
+# Stats cache
+# ---------------------------------------------------------------------------
+
+class TestStatsCache:
+    """stats reuses a JSON summary for sessions whose file hasn't changed."""
+
+    def test_summary_is_cached_as_json(self, tmp_path, state_file, monkeypatch):
+        path = tmp_path / "s0.jsonl"
+        path.write_text(json.dumps({
+            "type": "assistant", "timestamp": "2026-01-01T00:00:00Z",
+            "message": {"model": "m1", "content": [{"type": "text", "text": "hi"}],
+                        "usage": {"input_tokens": 3, "output_tokens": 2}},
+        }) + "\n")
+        first = _export_mod._session_summary(str(path))
+
+        with open(tmp_path / "stats_cache" / "s0.json", "rb") as f:
+            assert json.loads(f.read())[1] == first
+
+        def no_parse(*a, **kw):
+            raise AssertionError("cache hit expected")
+        monkeypatch.setattr(_export_mod, "parse_session_cached", no_parse)
+        assert _export_mod._session_summary(str(path)) == first
+
+    def test_prune_drops_stale_and_legacy_entries(self, tmp_path, state_file):
+        cache = tmp_path / "stats_cache"
+        cache.mkdir()
+        for name in ("live.json", "gone.json", "live.pkl"):
+            (cache / name).write_text("{}")
+        _export_mod._prune_stats_cache({"live"})
+        assert sorted(os.listdir(cache)) == ["live.json"]
+
+
+# ---------------------------------------------------------------------------
+# Checkpoints
+# ---------------------------------------------------------------------------
+
+class TestCheckpoint:
+    """An interrupted --no-zip export keeps the sessions it already wrote."""
+
+    def test_state_saved_before_crash(self, tmp_path, state_file, monkeypatch):
+        project = tmp_path / "projects" / "-home-u-app"
+        project.mkdir(parents=True)
+        for sid in ("s0", "s1", "s2"):
+            (project / f"{sid}.jsonl").write_text(json.dumps({
+                "type": "user", "timestamp": "2026-01-01T00:00:00Z",
+                "message": {"content": f"hello {sid}"},
+            }) + "\n")
+
+        monkeypatch.setattr(_export_mod, "_CHECKPOINT_EVERY", 1)
+        real_write = _export_mod._ExportSink.write
+
+        def write(sink, rel_path, content):
+            if sink.count == 2:
+                raise KeyboardInterrupt
+            real_write(sink, rel_path, content)
+
+        monkeypatch.setattr(_export_mod._ExportSink, "write", write)
+        args = type("Args", (), {
+            "base_dir": str(tmp_path / "projects"), "out": str(tmp_path / "out"),
+            "since": None, "no_zip": True, "project": None, "format": "md",
+            "session": None, "exclude_rules": None,
+        })
+        with pytest.raises(KeyboardInterrupt):
+            _export_mod.cmd_export(args)
+
+        state = _export_mod._load_state()
+        assert sorted(state["sessions"]) == ["s0", "s1"]
+        assert state["exportedCount"] == 2
+        assert not os.path.exists(state_file + ".tmp")
+
+
+# ---------------------------------------------------------------------------
+# --dedupe
+# ---------------------------------------------------------------------------
+
+class TestDedupe:
+    def test_identical_files_become_pointers(self, tmp_path):
+        with _export_mod._ExportSink(str(tmp_path), no_zip=True, dedupe=True) as sink:
+            assert sink.write("a.md", b"same") is None
+            assert sink.write("b.md", b"other") is None
+            assert sink.write("c.md", b"same") == "a.md"
+        assert (tmp_path / "a.md").read_bytes() == b"same"
+        assert (tmp_path / "c.md").read_bytes() == b"> duplicate of a.md\n"
+
+    def test_sessions_with_the_same_conversation_dedupe(self, tmp_path, state_file):
+        project = tmp_path / "projects" / "-home-u-app"
+        project.mkdir(parents=True)
+        lines = "".join(json.dumps(e) + "\n" for e in [
+            {"type": "user", "timestamp": "2026-01-01T00:00:00Z",
+             "message": {"content": "same question"}},
+            {"type": "assistant", "timestamp": "2026-01-01T00:00:05Z",
+             "message": {"model": "m1", "content": [{"type": "text", "text": "same answer"}]}},
+        ])
+        for sid in ("s0", "s1"):
+            (project / f"{sid}.jsonl").write_text(lines)
+        (project / "s2.jsonl").write_text(lines.replace("same answer", "other answer"))
+
+        args = type("Args", (), {
+            "base_dir": str(tmp_path / "projects"), "out": str(tmp_path / "out"),
+            "since": None, "no_zip": True, "project": None, "format": "both",
+            "session": None, "exclude_rules": None, "dedupe": True,
+        })
+        _export_mod.cmd_export(args)
+
+        with open(tmp_path / "out" / "manifest.jsonl") as f:
+            manifest = {e["session_id"]: e for e in map(json.loads, f)}
+        assert "duplicate_of" not in manifest["s0"]
+        assert "duplicate_of" not in manifest["s2"]
+        assert manifest["s1"]["duplicate_of"].endswith("s0.json")
+        pointers = [p for p in (tmp_path / "out").rglob("*__s1.*")]
+        assert len(pointers) == 2
+        for p in pointers:
+            assert p.read_text().startswith("> duplicate of ")
+
+
+# ---------------------------------------------------------------------------
+# _parallel_map
+# ---------------------------------------------------------------------------
+
+class TestParallelMap:
+    @pytest.mark.parametrize("n_tasks", [5, 100])
+    def test_results_in_order_and_every_path_hinted(self, monkeypatch, n_tasks):
+        hinted = []
+        monkeypatch.setattr(_export_mod, "_read_ahead", hinted.append)
+        monkeypatch.setattr(_export_mod.os, "cpu_count", lambda: 4)
+        tasks = list(range(-n_tasks, 0))
+        paths = [f"/p{i}" for i in range(n_tasks)]
+        assert list(_export_mod._parallel_map(abs, tasks, chunksize=8, paths=paths)) == [-t for t in tasks]
+        if hasattr(os, "posix_fadvise"):
+            assert sorted(hinted) == sorted(paths)
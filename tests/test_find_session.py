@@ -0,0 +1,53 @@
+"""_find_session() resolves ids and prefixes through the persisted session
+index, and must notice sessions added after the index was written.
+
+Run: pytest tests/test_find_session.py -v
+"""
+
+import os
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import scripts.export as _export_mod
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def base(tmp_path, monkeypatch):
+    monkeypatch.setattr(_export_mod, "STATE_DIR", str(tmp_path / "state"))
+    base = tmp_path / "projects"
+    for project, sid in [("-home-u-a", "aaaa1111"), ("-home-u-a", "aaaa2222"), ("-home-u-b", "bbbb1111")]:
+        (base / project).mkdir(parents=True, exist_ok=True)
+        (base / project / f"{sid}.jsonl").write_text("{}\n")
+    return base
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+class TestFindSession:
+    def test_exact_and_unique_prefix(self, base):
+        assert _export_mod._find_session("bbbb1111", str(base)) == str(base / "-home-u-b" / "bbbb1111.jsonl")
+        assert _export_mod._find_session("aaaa2", str(base)) == str(base / "-home-u-a" / "aaaa2222.jsonl")
+        assert os.path.isfile(os.path.join(_export_mod.STATE_DIR, "session_index.json"))
+
+    def test_ambiguous_prefix_exits(self, base):
+        with pytest.raises(SystemExit):
+            _export_mod._find_session("aaaa", str(base))
+
+    def test_unknown_session(self, base):
+        assert _export_mod._find_session("zzzz", str(base)) is None
+
+    def test_session_added_after_indexing(self, base):
+        _export_mod._find_session("bbbb", str(base))
+        (base / "-home-u-c").mkdir()
+        (base / "-home-u-c" / "cccc1111.jsonl").write_text("{}\n")
+        assert _export_mod._find_session("cccc", str(base)) == str(base / "-home-u-c" / "cccc1111.jsonl")
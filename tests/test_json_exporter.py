@@ -0,0 +1,79 @@
+"""dump_session() must write the same document session_to_json() returns,
+and session_to_json() must not depend on whether orjson is installed.
+
+Run: pytest tests/test_json_exporter.py -v
+"""
+
+import io
+import json
+import os
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import utils.json_exporter as json_exporter
+from utils import fastjson
+from utils.json_exporter import dump_session, session_to_json
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+SESSION = {
+    "session_id": "abc-123",
+    "title": "Fix the café bug",
+    "metadata": {"models_used": ["claude-opus-4"], "files": {"b.py", "a.py"}},
+    "messages": [
+        {"role": "user", "text": "hello é", "tags": {"y", "x"}},
+        {"role": "assistant", "text": "hi", "timestamp": "2026-01-01T00:00:00Z"},
+    ],
+}
+
+
+def _without_export_time(text):
+    doc = json.loads(text)
+    doc.pop("exported_at")
+    return doc
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+class TestDumpSession:
+    def test_matches_session_to_json(self):
+        buf = io.BytesIO()
+        dump_session(SESSION, buf, {"turns": 1})
+        written = _without_export_time(buf.getvalue().decode("utf-8"))
+        assert written == _without_export_time(session_to_json(SESSION, {"turns": 1}))
+        assert written["metadata"]["files"] == ["a.py", "b.py"]
+        assert written["messages"][0]["tags"] == ["x", "y"]
+
+    def test_streamed_path_matches(self, monkeypatch):
+        monkeypatch.setattr(json_exporter, "_ONE_SHOT_MAX_MESSAGES", 0)
+        buf = io.BytesIO()
+        dump_session(SESSION, buf)
+        expected = _without_export_time(session_to_json(SESSION))
+        assert _without_export_time(buf.getvalue()) == expected
+
+    def test_leaves_file_open(self):
+        buf = io.BytesIO()
+        dump_session(SESSION, buf)
+        assert not buf.closed
+        assert "café".encode("utf-8") in buf.getvalue()
+
+
+class TestOrjsonFastPath:
+    @pytest.mark.parametrize("indent", [2, None])
+    def test_same_text_with_and_without_orjson(self, monkeypatch, indent):
+        pytest.importorskip("orjson")
+        fast = session_to_json(SESSION, {"cost": 1.25, "n": None}, indent=indent)
+        monkeypatch.setattr(fastjson, "orjson", None)
+        slow = session_to_json(SESSION, {"cost": 1.25, "n": None}, indent=indent)
+        # Only the export timestamp may differ.
+        assert _without_export_time(fast) == _without_export_time(slow)
+        assert fast.count("\n") == slow.count("\n")
@@ -0,0 +1,46 @@
+"""FastJSONProvider: jsonify() goes through utils.fastjson via dumps(),
+keeping key order and UTF-8, with Flask's own response() around it.
+
+Run: pytest tests/test_json_provider.py -v
+"""
+
+import json
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from flask import jsonify
+
+from app import create_app
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+class TestFastJSONProvider:
+    def test_compact_keeps_order_and_utf8(self):
+        app = create_app(search_index=False)
+        with app.app_context():
+            resp = jsonify({"b": 1, "a": "é"})
+        assert resp.get_data() == '{"b":1,"a":"é"}\n'.encode("utf-8")
+        assert resp.mimetype == "application/json"
+
+    def test_positional_and_keyword_args_are_packed(self):
+        app = create_app(search_index=False)
+        with app.app_context():
+            assert json.loads(jsonify(1, 2).get_data()) == [1, 2]
+            assert json.loads(jsonify(x=1).get_data()) == {"x": 1}
+
+    def test_debug_is_indented(self):
+        app = create_app(search_index=False)
+        app.debug = True
+        with app.app_context():
+            assert jsonify({"a": [1]}).get_data() == b'{\n  "a": [\n    1\n  ]\n}\n'
+
+    def test_sort_keys_falls_back_to_stdlib(self):
+        app = create_app(search_index=False)
+        app.json.sort_keys = True
+        assert app.json.dumps({"b": 1, "a": 2}) == '{"a": 2, "b": 1}'
@@ -18,7 +18,7 @@ import pytest
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
-from utils.jsonl_parser import parse_session, _process_assistant
+from utils.jsonl_parser import new_metadata, parse_session, _process_assistant
 from utils.session_stats import _estimate_cost
 
 
@@ -27,37 +27,9 @@ from utils.session_stats import _estimate_cost
 # ---------------------------------------------------------------------------
 
 def _fresh_metadata() -> dict:
-    """Return a minimal metadata dict matching what parse_session initialises."""
-    return {
-        "models_used": set(),
-        "total_input_tokens": 0,
-        "total_output_tokens": 0,
-        "total_cache_read_tokens": 0,
-        "total_cache_creation_tokens": 0,
-        "total_tool_calls": 0,
-        "tool_call_counts": {},
-        "first_timestamp": None,
-        "last_timestamp": None,
-        "total_ephemeral_5m_tokens": 0,
-        "total_ephemeral_1h_tokens": 0,
-        "service_tiers": set(),
-        "stop_reasons": {},
-        "api_errors": 0,
-        "files_read": set(),
-        "files_written": set(),
-        "files_created": set(),
-        "bash_commands": [],
-        "web_fetches": [],
-        "sidechain_messages": 0,
-        "entry_counts": {},
-        "compactions": 0,
-        "compact_boundaries": [],
-        "session_wall_time_seconds": None,
-        "version": None,
-        "cwd": None,
-        "git_branch": None,
-        "permission_mode": None,
-    }
+    """Return the metadata dict parse_session initialises, from the parser
+    itself so the two can't drift apart."""
+    return new_metadata("test-session")
 
 
 def _assistant_entry(usage: dict) -> dict:
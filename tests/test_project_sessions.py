@@ -0,0 +1,77 @@
+"""/api/projects/<name>/sessions serves warm listings from the small
+per-file summary cache, not from full parses.
+
+Run: pytest tests/test_project_sessions.py -v
+"""
+
+import json
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import api.projects as projects_mod
+from app import create_app
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _write_session(project_dir, session_id, text):
+    path = project_dir / f"{session_id}.jsonl"
+    path.write_text(json.dumps({
+        "type": "user", "timestamp": "2026-01-01T00:00:00Z",
+        "message": {"content": text},
+    }) + "\n")
+    return path
+
+
+def _listing(client):
+    resp = client.get("/api/projects/-home-u-app/sessions")
+    assert resp.status_code == 200
+    return {s["id"]: s["title"] for s in resp.get_json()}
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+class TestSessionListing:
+    def test_warm_listing_does_not_parse(self, tmp_path, monkeypatch):
+        project = tmp_path / "projects" / "-home-u-app"
+        project.mkdir(parents=True)
+        _write_session(project, "s0", "first question")
+        s1 = _write_session(project, "s1", "second question")
+        client = create_app(base_dir=str(tmp_path / "projects"), search_index=False).test_client()
+
+        assert _listing(client) == {"s0": "first question", "s1": "second question"}
+
+        parsed = []
+        real = projects_mod.parse_session
+        monkeypatch.setattr(projects_mod, "parse_session", lambda p: (parsed.append(p), real(p))[1])
+        assert _listing(client) == {"s0": "first question", "s1": "second question"}
+        assert parsed == []
+
+        s1.write_text(s1.read_text() + json.dumps({
+            "type": "assistant", "timestamp": "2026-01-01T00:00:05Z",
+            "message": {"content": [{"type": "text", "text": "answer"}]},
+        }) + "\n")
+        _listing(client)
+        assert parsed == [str(s1)]
+
+    def test_excluded_sessions_are_left_out(self, tmp_path):
+        project = tmp_path / "projects" / "-home-u-app"
+        project.mkdir(parents=True)
+        _write_session(project, "s0", "first question")
+        _write_session(project, "s1", "a secret question")
+        rules = tmp_path / "rules.txt"
+        rules.write_text("secret\n")
+        client = create_app(
+            base_dir=str(tmp_path / "projects"),
+            exclusion_rules_path=str(rules),
+            search_index=False,
+        ).test_client()
+
+        assert _listing(client) == {"s0": "first question"}
@@ -0,0 +1,69 @@
+"""quick_session_title() must agree with the title parse_session() infers,
+since bulk export and the sessions list skip untitled sessions on its word.
+
+Run: pytest tests/test_quick_session_title.py -v
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from utils.jsonl_parser import parse_session, quick_session_title
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _user(content):
+    return {"type": "user", "message": {"role": "user", "content": content}}
+
+
+def _assistant(text):
+    return {
+        "type": "assistant",
+        "message": {"role": "assistant", "content": [{"type": "text", "text": text}]},
+    }
+
+
+def _write(tmp_path, entries, name="s.jsonl"):
+    path = tmp_path / name
+    with open(path, "w", encoding="utf-8") as f:
+        for e in entries:
+            f.write((e if isinstance(e, str) else json.dumps(e)) + "\n")
+    return str(path)
+
+
+CASES = {
+    "plain": [_user("Fix the login bug\nmore detail")],
+    "blocks": [_user([{"type": "text", "text": "Block title"}])],
+    "system_tags_only_first": [
+        _user("<system-reminder>ignore me</system-reminder>"),
+        _user("Real question"),
+    ],
+    "no_user_text": [_assistant("hello"), _user([{"type": "tool_result", "content": "x"}])],
+    "empty": [],
+    "garbage_lines": ["not json", "", _user("After garbage")],
+    "spaced_json": ['{"type": "user", "message": {"content": "Spaced keys"}}'],
+    "title_after_many_lines": [_assistant(f"filler {i}") for i in range(200)] + [_user("Late title")],
+}
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+class TestQuickSessionTitle:
+    @pytest.mark.parametrize("name", sorted(CASES))
+    def test_agrees_with_parse_session(self, tmp_path, name):
+        path = _write(tmp_path, CASES[name])
+        assert quick_session_title(path) == parse_session(path)["title"]
+
+    def test_reads_past_the_quick_info_window(self, tmp_path):
+        path = _write(tmp_path, CASES["title_after_many_lines"])
+        assert quick_session_title(path) == "Late title"
@@ -0,0 +1,185 @@
+"""
+Tests for the SQLite full-text search index (utils/search_index.py).
+
+Results served from the index must match the brute-force scan exactly, and
+the index must pick up appended, new and deleted session files.
+
+Run:
+    pytest tests/test_search_index.py -v
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from api.search import _search_index, _search_scan
+from app import create_app
+from utils.exclusion_rules import _parse_rule, compile_rules
+from utils.search_index import open_search_index
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _user(text: str, ts: str) -> dict:
+    return {
+        "type": "user",
+        "timestamp": ts,
+        "message": {"role": "user", "content": [{"type": "text", "text": text}]},
+    }
+
+
+def _assistant(text: str, ts: str) -> dict:
+    return {
+        "type": "assistant",
+        "timestamp": ts,
+        "message": {
+            "role": "assistant",
+            "model": "claude-sonnet-4",
+            "content": [{"type": "text", "text": text}],
+            "usage": {"input_tokens": 1, "output_tokens": 1},
+        },
+    }
+
+
+def _write(path, entries, mode="w"):
+    with open(path, mode, encoding="utf-8") as f:
+        for e in entries:
+            f.write(json.dumps(e) + "\n")
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    base = tmp_path / "projects"
+    alpha = base / "-home-user-alpha"
+    beta = base / "-home-user-beta"
+    alpha.mkdir(parents=True)
+    beta.mkdir(parents=True)
+    _write(alpha / "a1.jsonl", [
+        _user("How do I parse JSON in Python?", "2026-01-01T00:00:00Z"),
+        _assistant("Use the json module. JSON is easy.", "2026-01-01T00:00:05Z"),
+    ])
+    _write(alpha / "a2.jsonl", [
+        _user("Secret plans for the Python migration", "2026-01-02T00:00:00Z"),
+        _assistant("Noted.", "2026-01-02T00:00:05Z"),
+    ])
+    _write(beta / "b1.jsonl", [
+        _user("Grüße aus Köln, ÄÖÜ python", "2026-01-03T00:00:00Z"),
+        _assistant("Hallo!", "2026-01-03T00:00:05Z"),
+    ])
+    index = open_search_index(str(tmp_path / "search.db"))
+    assert index is not None
+    return base, index
+
+
+def _both(base, index, query, rules=(), limit=50):
+    matcher = compile_rules(list(rules))
+    index.refresh(str(base), matcher)
+    via_index = _search_index(index, str(base), query, limit)
+    via_scan = _search_scan(str(base), query, limit, matcher)
+    return via_index, via_scan
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+class TestSearchIndexMatchesScan:
+    @pytest.mark.parametrize("query", ["json", "python", "js", "p", "köln", "äöü", "nothing here", 'a "quote'])
+    def test_same_results(self, corpus, query):
+        base, index = corpus
+        via_index, via_scan = _both(base, index, query)
+        assert via_index == via_scan
+
+    def test_limit(self, corpus):
+        base, index = corpus
+        via_index, via_scan = _both(base, index, "python", limit=2)
+        assert len(via_index) == 2
+        assert via_index == via_scan
+
+    def test_exclusion_rules_apply(self, corpus):
+        base, index = corpus
+        rules = [_parse_rule("secret")]
+        via_index, via_scan = _both(base, index, "python", rules=rules)
+        assert via_index == via_scan
+        assert all(r["session_id"] != "a2" for r in via_index)
+
+
+class TestSearchIndexRefresh:
+    def test_initial_refresh_indexes_everything(self, corpus):
+        base, index = corpus
+        assert index.refresh(str(base)) == 3
+        assert index.refresh(str(base)) == 0
+
+    def test_appended_session_is_reindexed(self, corpus):
+        base, index = corpus
+        index.refresh(str(base))
+        path = base / "-home-user-alpha" / "a1.jsonl"
+        _write(path, [_user("follow-up about zebras", "2026-01-01T00:01:00Z")], mode="a")
+        via_index, via_scan = _both(base, index, "zebras")
+        assert [r["session_id"] for r in via_index] == ["a1"]
+        assert via_index == via_scan
+
+    def test_deleted_session_is_dropped(self, corpus):
+        base, index = corpus
+        index.refresh(str(base))
+        os.remove(base / "-home-user-beta" / "b1.jsonl")
+        via_index, via_scan = _both(base, index, "python")
+        assert via_index == via_scan
+        assert all(r["session_id"] != "b1" for r in via_index)
+
+
+class TestSearchIndexExclusion:
+    """Excluded sessions must never have their text stored in the index."""
+
+    def _stored_text(self, index):
+        conn = index._connect()
+        try:
+            return " ".join(row[0] for row in conn.execute("SELECT text FROM messages"))
+        finally:
+            conn.close()
+
+    def test_excluded_session_not_stored(self, corpus):
+        base, index = corpus
+        index.refresh(str(base), compile_rules([_parse_rule("secret")]))
+        assert "Secret plans" not in self._stored_text(index)
+        assert "parse JSON" in self._stored_text(index)
+
+    def test_excluded_session_has_no_rows(self, corpus):
+        base, index = corpus
+        index.refresh(str(base), compile_rules([_parse_rule("secret")]))
+        conn = index._connect()
+        try:
+            rows = conn.execute(
+                "SELECT COUNT(*) FROM messages m JOIN files f ON m.path = f.path"
+                " WHERE f.session_id = 'a2'"
+            ).fetchone()[0]
+            recorded = conn.execute("SELECT COUNT(*) FROM files WHERE session_id = 'a2'").fetchone()[0]
+        finally:
+            conn.close()
+        assert (recorded, rows) == (1, 0)
+
+    def test_rules_change_purges_and_rebuilds(self, corpus):
+        base, index = corpus
+        index.refresh(str(base))
+        assert "Secret plans" in self._stored_text(index)
+        assert index.refresh(str(base), compile_rules([_parse_rule("secret")])) == 3
+        assert "Secret plans" not in self._stored_text(index)
+        # Dropping the rule brings the session back.
+        assert index.refresh(str(base)) == 3
+        assert "Secret plans" in self._stored_text(index)
+
+
+class TestSearchIndexSwitch:
+    def test_disabled_index_falls_back_to_scan(self, corpus):
+        base, _index = corpus
+        app = create_app(base_dir=str(base), search_index=False)
+        assert app.config["SEARCH_INDEX_PATH"] is None
+        resp = app.test_client().get("/api/search?q=python")
+        assert [r["session_id"] for r in resp.get_json()] == ["a1", "a2", "b1"]
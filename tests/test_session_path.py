@@ -0,0 +1,49 @@
+"""safe_join_cached() must re-check a path once a symlink along it changes.
+
+Run: pytest tests/test_session_path.py -v
+"""
+
+import os
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from utils.session_path import safe_join_cached
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+class TestSafeJoinCached:
+    def test_swapped_project_symlink_is_rejected(self, tmp_path):
+        base = tmp_path / "projects"
+        (base / "real").mkdir(parents=True)
+        (base / "real" / "s.jsonl").write_text("{}\n")
+        outside = tmp_path / "outside"
+        outside.mkdir()
+        (outside / "s.jsonl").write_text("{}\n")
+        link = base / "proj"
+        link.symlink_to(base / "real")
+
+        assert safe_join_cached(str(base), "proj", "s.jsonl") == str(base / "real" / "s.jsonl")
+
+        link.unlink()
+        link.symlink_to(outside)
+        with pytest.raises(ValueError):
+            safe_join_cached(str(base), "proj", "s.jsonl")
+
+    def test_retargeted_base_is_resolved_again(self, tmp_path):
+        for name in ("a", "b"):
+            (tmp_path / name / "proj").mkdir(parents=True)
+        base = tmp_path / "base"
+        base.symlink_to(tmp_path / "a")
+
+        assert safe_join_cached(str(base), "proj", "s.jsonl") == str(tmp_path / "a" / "proj" / "s.jsonl")
+
+        base.unlink()
+        base.symlink_to(tmp_path / "b")
+        assert safe_join_cached(str(base), "proj", "s.jsonl") == str(tmp_path / "b" / "proj" / "s.jsonl")
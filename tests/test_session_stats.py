@@ -0,0 +1,78 @@
+"""compute_stats_streaming() must give the same stats as compute_stats() on
+a fully parsed session; /api/sessions/.../stats relies on it.
+
+Run: pytest tests/test_session_stats.py -v
+"""
+
+import json
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from utils.jsonl_parser import parse_session
+from utils.session_stats import compute_stats, compute_stats_streaming
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _assistant(ts, model, content, inp=100, out=50):
+    return {
+        "type": "assistant",
+        "timestamp": ts,
+        "message": {
+            "model": model,
+            "content": content,
+            "stop_reason": "tool_use",
+            "usage": {"input_tokens": inp, "output_tokens": out},
+        },
+    }
+
+
+def _tool_result(ts, result):
+    return {
+        "type": "user",
+        "timestamp": ts,
+        "toolUseResult": result,
+        "message": {"content": [{"type": "tool_result", "content": "r"}]},
+    }
+
+
+ENTRIES = [
+    {"type": "user", "timestamp": "2025-01-01T00:00:00Z", "message": {"content": "Run the tests"}},
+    _assistant("2025-01-01T00:00:05Z", "claude-sonnet-4", [
+        {"type": "text", "text": "Running."},
+        {"type": "tool_use", "id": "t1", "name": "Bash", "input": {"command": "pytest"}},
+    ]),
+    _tool_result("2025-01-01T00:00:09Z", {"stdout": "ok", "stderr": "", "interrupted": False}),
+    _assistant("2025-01-01T00:00:12Z", "claude-opus-4", [
+        {"type": "tool_use", "id": "t2", "name": "Read", "input": {"file_path": "/a.py"}},
+        {"type": "tool_use", "id": "t3", "name": "Bash", "input": {"command": "ls"}},
+    ], inp=None, out=7),
+    _tool_result("2025-01-01T00:00:13Z", {"filenames": ["a.py"], "numFiles": 1, "durationMs": 3}),
+    {"type": "system", "subtype": "compact_boundary", "timestamp": "2025-01-01T00:01:00Z",
+     "compactMetadata": {"trigger": "auto", "preTokens": 1000}},
+    {"type": "progress", "timestamp": "2025-01-01T00:01:01Z", "data": {"type": "bash_progress"}},
+]
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+class TestComputeStatsStreaming:
+    def test_matches_compute_stats(self, tmp_path):
+        path = tmp_path / "s.jsonl"
+        path.write_text("\n".join(json.dumps(e) for e in ENTRIES) + "\nnot json\n", encoding="utf-8")
+        expected = compute_stats(parse_session(str(path)))
+        assert compute_stats_streaming(str(path)) == expected
+        assert expected["conversation_turns"] == 2
+        assert [c["command"] for c in expected["commands_run"]] == ["pytest", "ls"]
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "empty.jsonl"
+        path.write_text("", encoding="utf-8")
+        assert compute_stats_streaming(str(path)) == compute_stats(parse_session(str(path)))
@@ -0,0 +1,80 @@
+"""The streamed /api/sessions body must decode to exactly the parsed session.
+
+Run: pytest tests/test_session_stream.py -v
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import api.sessions as sessions_mod
+from app import create_app
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _write_session(project_dir, session_id, n_messages):
+    os.makedirs(project_dir, exist_ok=True)
+    path = os.path.join(project_dir, f"{session_id}.jsonl")
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(n_messages):
+            f.write(json.dumps({
+                "type": "user",
+                "timestamp": f"2025-01-01T00:00:{i % 60:02d}Z",
+                "message": {"role": "user", "content": f"message {i} é"},
+            }) + "\n")
+    return path
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+class TestSessionStream:
+    @pytest.mark.parametrize("n_messages", [0, 1, 5, 12])
+    def test_body_matches_parsed_session(self, tmp_path, monkeypatch, n_messages):
+        monkeypatch.setattr(sessions_mod, "_MESSAGES_PER_CHUNK", 5)
+        base = str(tmp_path / "projects")
+        _write_session(os.path.join(base, "proj"), "abc", n_messages)
+        client = create_app(base_dir=base).test_client()
+
+        resp = client.get("/api/sessions/proj/abc")
+        assert resp.status_code == 200
+        assert resp.mimetype == "application/json"
+
+        body = json.loads(resp.data)
+        expected = json.loads(json.dumps(
+            sessions_mod.parse_session_cached(os.path.join(base, "proj", "abc.jsonl"))
+        ))
+        assert body == expected
+        assert len(body["messages"]) == n_messages
+
+    def test_top_level_key_order_is_preserved(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(sessions_mod, "_MESSAGES_PER_CHUNK", 5)
+        base = str(tmp_path / "projects")
+        path = _write_session(os.path.join(base, "proj"), "abc", 7)
+        client = create_app(base_dir=base).test_client()
+
+        body = json.loads(client.get("/api/sessions/proj/abc").data)
+        assert list(body) == list(sessions_mod.parse_session_cached(path))
+
+    def test_unencodable_head_is_a_json_500(self, tmp_path, monkeypatch):
+        base = str(tmp_path / "projects")
+        _write_session(os.path.join(base, "proj"), "abc", 3)
+        real = sessions_mod.parse_session_cached
+        monkeypatch.setattr(
+            sessions_mod, "parse_session_cached",
+            lambda p, st=None: {**real(p, st), "bad": object()},
+        )
+        client = create_app(base_dir=base).test_client()
+
+        resp = client.get("/api/sessions/proj/abc")
+        assert resp.status_code == 500
+        assert "error" in resp.get_json()
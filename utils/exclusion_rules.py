@@ -24,15 +24,29 @@ re-running the CLI export) to take effect.
 
 from __future__ import annotations
 
+import hashlib
+import itertools
+import json
 import logging
 import os
 import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
 from pathlib import Path
 
+try:
+    import ahocorasick
+except ImportError:  # optional speedup for large rule files
+    ahocorasick = None
+
 _logger = logging.getLogger(__name__)
 
 DEFAULT_EXCLUSION_RULES_FILENAME = "exclusion-rules.txt"
 
+# Below this many distinct terms, one ``in`` per term beats a single
+# Aho-Corasick pass over the text.
+_AUTOMATON_MIN_TERMS = 32
+
 
 def get_default_exclusion_rules_path() -> str:
     """Return the path to the default exclusion rules file."""
@@ -64,62 +78,60 @@ def resolve_exclusion_rules_path(cli_path: str | None) -> str | None:
     return None
 
 
+# The leading \b of "\bAND\b" always holds at the start of the string, so
+# these only need the trailing one.
+_RE_SPACE = re.compile(r"\s+")
+_RE_AND = re.compile(r"AND\b", re.IGNORECASE)
+_RE_OR = re.compile(r"OR\b", re.IGNORECASE)
+_RE_WORD = re.compile(r"\S+")
+
+
 def _tokenize_rule(line: str) -> list:
     """
     Tokenize a rule line into terms and operators.
 
     Returns a list where each element is ``"AND"``, ``"OR"``, or a
-    ``(kind, value)`` tuple (kind is ``"word"`` or ``"phrase"``).
+    ``(kind, value)`` tuple (kind is ``"word"`` or ``"phrase"``).  Values
+    are lowercased here, once, since matching is case-insensitive.
     """
     tokens = []
     rest = line.strip()
     while rest:
-        m = re.match(r"\s+", rest)
+        m = _RE_SPACE.match(rest)
         if m:
             rest = rest[m.end():]
             continue
-        if re.match(r"\bAND\b", rest, re.IGNORECASE):
+        if _RE_AND.match(rest):
             tokens.append("AND")
             rest = rest[3:].lstrip()
             continue
-        if re.match(r"\bOR\b", rest, re.IGNORECASE):
+        if _RE_OR.match(rest):
             tokens.append("OR")
             rest = rest[2:].lstrip()
             continue
         if rest.startswith('"'):
             end = rest.find('"', 1)
             if end == -1:
-                tokens.append(("word", rest[1:].strip()))
+                tokens.append(("word", rest[1:].strip().lower()))
                 break
-            tokens.append(("phrase", rest[1:end]))
+            tokens.append(("phrase", rest[1:end].lower()))
             rest = rest[end + 1:].lstrip()
             continue
-        m = re.match(r"\S+", rest)
+        m = _RE_WORD.match(rest)
         if m:
-            tokens.append(("word", m.group(0)))
+            tokens.append(("word", m.group(0).lower()))
             rest = rest[m.end():].lstrip()
             continue
         break
     return tokens
 
 
-def _term_matches(term: tuple, text: str) -> bool:
-    """Case-insensitive substring match for a single term."""
-    _kind, value = term
-    if not value:
-        return False
-    return value.lower() in text.lower()
-
-
-def _rule_matches(tokens: list, text: str) -> bool:
+def _split_clauses(tokens: list) -> list[list]:
     """
-    Evaluate a tokenized rule against *text*.
+    Split a tokenized rule into its OR-separated clauses of AND-ed terms.
 
-    Operator precedence: AND binds tighter than OR.
     Adjacent terms without an explicit operator are treated as AND.
     """
-    if not tokens:
-        return False
     clauses: list[list] = []
     current: list = []
     for t in tokens:
@@ -133,21 +145,155 @@ def _rule_matches(tokens: list, text: str) -> bool:
             current.append(t)
     if current:
         clauses.append(current)
+    return clauses
 
-    for clause in clauses:
-        if not clause:
-            continue
-        terms = [t for t in clause if isinstance(t, tuple)]
-        if terms and all(_term_matches(term, text) for term in terms):
-            return True
-    return False
+
+@dataclass(frozen=True, slots=True)
+class Rule:
+    """One rule line, reduced to its OR-ed clauses of AND-ed, lowercased
+    needles: ``a OR b AND c`` is ``(("a",), ("b", "c"))``."""
+
+    clauses: tuple[tuple[str, ...], ...]
 
 
-def load_rules(path: str | None) -> list[list]:
+def _parse_rule(line: str) -> Rule:
+    """
+    Parse one rule line into a :class:`Rule`.
+
+    Operator precedence: AND binds tighter than OR.  Adjacent terms without
+    an explicit operator are treated as AND.  A clause with an empty term
+    (``""``) can never match, so it is dropped here.
+    """
+    clauses = []
+    for clause in _split_clauses(_tokenize_rule(line)):
+        needles = tuple(value for _kind, value in clause)
+        if all(needles):
+            clauses.append(needles)
+    return Rule(tuple(clauses))
+
+
+def _rule_matches(rule: Rule, text_lower: str) -> bool:
+    """Evaluate *rule* against lowercased *text_lower*."""
+    return any(all(n in text_lower for n in clause) for clause in rule.clauses)
+
+
+class ExclusionMatcher:
+    """
+    Exclusion rules compiled once for matching against many texts.
+
+    Single-term clauses (the common ``a OR b OR c`` shape) are reduced to a
+    minimal set of literals; clauses that AND several terms keep their term
+    tuples.  With a handful of terms everything is checked with plain ``in``
+    on the lowercased text: CPython's substring search skips through the
+    text far faster than an ``re`` alternation, which retries every branch
+    at every position.  Large rule files, when pyahocorasick is installed,
+    get one automaton over all terms instead, so each text is scanned once
+    rather than once per term.
+    Matching is case-insensitive, exactly like :func:`is_excluded_by_rules`.
+    """
+
+    def __init__(self, any_terms: list[str], and_clauses: list[tuple[str, ...]]):
+        # A term containing a shorter term can never be the deciding match.
+        unique = sorted(set(any_terms), key=len)
+        kept: list[str] = []
+        for term in unique:
+            if not any(shorter in term for shorter in kept):
+                kept.append(term)
+        self._any_terms = tuple(kept)
+        self._any_set = frozenset(kept)
+        self._and_clauses = and_clauses
+        self._automaton = _build_automaton(self._any_set.union(*and_clauses))
+
+    def __bool__(self) -> bool:
+        return bool(self._any_terms) or bool(self._and_clauses)
+
+    @property
+    def key(self) -> str:
+        """Stable digest of what this matcher excludes; empty without rules.
+        Lets anything that stores filtered data notice a rules change."""
+        if not self:
+            return ""
+        spec = [sorted(self._any_terms), sorted(self._and_clauses)]
+        return hashlib.sha1(json.dumps(spec).encode("utf-8")).hexdigest()
+
+    def matches(self, searchable_text: str) -> bool:
+        """Return ``True`` if *searchable_text* matches any compiled rule."""
+        if not searchable_text:
+            return False
+        return self.matches_chunks((searchable_text,))
+
+    def matches_chunks(self, chunks: Iterable[str]) -> bool:
+        """
+        Like :meth:`matches`, but over the pieces of the searchable text
+        rather than their newline-joined concatenation.  Rule terms never
+        contain a newline, so no match can straddle two pieces; AND clauses
+        are satisfied by terms found in different pieces.  Stops at the
+        first piece that completes a match.
+        """
+        pending = [set(clause) for clause in self._and_clauses]
+        any_terms = self._any_terms
+        any_set = self._any_set
+        automaton = self._automaton
+        for chunk in chunks:
+            if not chunk:
+                continue
+            text = chunk.lower()
+            if automaton is not None:
+                found = set()
+                for _end, term in automaton.iter(text):
+                    if term in any_set:
+                        return True
+                    found.add(term)
+                if not found:
+                    continue
+            else:
+                if any(term in text for term in any_terms):
+                    return True
+                found = None
+            for terms in pending:
+                if found is None:
+                    terms.difference_update([t for t in terms if t in text])
+                else:
+                    terms -= found
+                if not terms:
+                    return True
+        return False
+
+
+def _build_automaton(terms: set[str]):
+    """Return an Aho-Corasick automaton over *terms* (each term is its own
+    value), or None when there are too few terms or pyahocorasick is
+    missing."""
+    if ahocorasick is None or len(terms) < _AUTOMATON_MIN_TERMS:
+        return None
+    automaton = ahocorasick.Automaton()
+    for term in terms:
+        automaton.add_word(term, term)
+    automaton.make_automaton()
+    return automaton
+
+
+def compile_rules(rules: list[Rule]) -> ExclusionMatcher:
+    """
+    Compile *rules* (as returned by :func:`load_rules`) into an
+    :class:`ExclusionMatcher`.
+    """
+    any_terms: list[str] = []
+    and_clauses: list[tuple[str, ...]] = []
+    for rule in rules:
+        for clause in rule.clauses:
+            if len(clause) == 1:
+                any_terms.append(clause[0])
+            else:
+                and_clauses.append(clause)
+    return ExclusionMatcher(any_terms, and_clauses)
+
+
+def load_rules(path: str | None) -> list[Rule]:
     """
     Load and parse the exclusion rule file at *path*.
 
-    Returns a list of tokenized rules.  Returns ``[]`` when *path* is
+    Returns a list of :class:`Rule`.  Returns ``[]`` when *path* is
     ``None``, the file doesn't exist, or it cannot be read.
     """
     if not path or not os.path.isfile(path):
@@ -159,9 +305,9 @@ def load_rules(path: str | None) -> list[list]:
                 line = line.strip()
                 if not line or line.startswith("#"):
                     continue
-                tokens = _tokenize_rule(line)
-                if tokens:
-                    rules.append(tokens)
+                rule = _parse_rule(line)
+                if rule.clauses:
+                    rules.append(rule)
     except (OSError, UnicodeDecodeError) as e:
         _logger.warning(
             "Failed to read exclusion rules from %s (%s)",
@@ -173,7 +319,7 @@ def load_rules(path: str | None) -> list[list]:
     return rules
 
 
-def is_excluded_by_rules(rules: list[list], searchable_text: str) -> bool:
+def is_excluded_by_rules(rules: list[Rule], searchable_text: str) -> bool:
     """
     Return ``True`` if *searchable_text* matches any exclusion rule.
 
@@ -181,12 +327,41 @@ def is_excluded_by_rules(rules: list[list], searchable_text: str) -> bool:
     """
     if not searchable_text or not rules:
         return False
-    for tokenized in rules:
-        if _rule_matches(tokenized, searchable_text):
+    text_lower = searchable_text.lower()
+    for rule in rules:
+        if _rule_matches(rule, text_lower):
             return True
     return False
 
 
+def is_excluded_by_rules_chunks(rules: list[Rule], chunks: Iterable[str]) -> bool:
+    """
+    Chunked form of :func:`is_excluded_by_rules`: *chunks* are the pieces
+    that would otherwise be joined into the searchable text (see
+    :func:`iter_searchable_parts`).
+    """
+    if not rules:
+        return False
+    return compile_rules(rules).matches_chunks(chunks)
+
+
+def iter_searchable_parts(
+    *,
+    project_name: str | None = None,
+    session_title: str | None = None,
+    model_names: Iterable[str] | None = None,
+    content_parts: Iterable[str] | None = None,
+) -> Iterator[str]:
+    """
+    Yield the pieces :func:`build_searchable_text` would join, one message
+    at a time, so matching never builds the whole session text in memory.
+    Empty and None pieces are passed through; the matchers skip them.
+    """
+    return itertools.chain(
+        (project_name, session_title), model_names or (), content_parts or ()
+    )
+
+
 def build_searchable_text(
     *,
     project_name: str | None = None,
@@ -0,0 +1,35 @@
+"""Thin JSON shim: uses orjson when it's installed and falls back to the
+stdlib otherwise, so the app keeps working with just requirements.txt.
+
+Both paths produce the same compact, UTF-8 output and raise
+json.JSONDecodeError (orjson's error subclasses it) on bad input."""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+
+def loads(data: str | bytes):
+    """Decode one JSON document from str or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj, default=None, indent: bool = False) -> bytes:
+    """Encode *obj* as compact UTF-8 JSON bytes, or indented by two spaces
+    with *indent*."""
+    if orjson is not None:
+        # OPT_NON_STR_KEYS: stringify int/None keys like the stdlib does.
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=default, option=option)
+    return json.dumps(
+        obj, default=default, ensure_ascii=False,
+        indent=2 if indent else None,
+        separators=(",", ": ") if indent else (",", ":"),
+    ).encode("utf-8")
@@ -1,45 +1,64 @@
 """JSON export format. Dumps everything -- no data loss compared to the raw
 JSONL, but in a sane structure with computed stats included."""
 
+import io
 import json
 from datetime import datetime, timezone
 
+from utils import fastjson
+
+# Sessions with fewer messages than this (a couple of MB of JSON at most)
+# are encoded in one go by dump_session; bigger ones are streamed.
+_ONE_SHOT_MAX_MESSAGES = 500
+
 
 def session_to_json(session: dict, stats: dict = None, indent: int = 2) -> str:
     """Serialize a parsed session to a JSON string with schema versioning.
     Pass indent=None if you want compact output for piping."""
-    output = {
+    output = _build_output(session, stats)
+    if indent in (None, 2):
+        # Those two layouts are all orjson offers; fastjson uses it if present.
+        return fastjson.dumps(
+            output, default=_json_default, indent=bool(indent)
+        ).decode("utf-8")
+    return json.dumps(output, indent=indent, default=_json_default, ensure_ascii=False)
+
+
+def dump_session(session: dict, fp, stats: dict = None, indent: int = 2):
+    """Like session_to_json, but encode straight into the binary file *fp*
+    so a big session is never held as one string. *fp* is left open."""
+    output = _build_output(session, stats)
+    if indent in (None, 2) and len(session["messages"]) < _ONE_SHOT_MAX_MESSAGES:
+        # Small enough to encode in memory and hand over in one write.
+        fp.write(fastjson.dumps(output, default=_json_default, indent=bool(indent)))
+        return
+    writer = io.TextIOWrapper(fp, encoding="utf-8", write_through=False)
+    try:
+        json.dump(
+            output, writer,
+            indent=indent, default=_json_default, ensure_ascii=False,
+        )
+        writer.flush()
+    finally:
+        writer.detach()
+
+
+def _build_output(session: dict, stats: dict | None) -> dict:
+    return {
         "schema_version": "2.0",
         "exported_at": datetime.now(timezone.utc).isoformat(),
         "session_id": session["session_id"],
         "title": session["title"],
-        "metadata": _serialize_metadata(session["metadata"]),
+        "metadata": session["metadata"],
         "stats": stats,
-        "messages": _serialize_messages(session["messages"]),
+        "messages": session["messages"],
     }
-    return json.dumps(output, indent=indent, default=str, ensure_ascii=False)
-
-
-def _serialize_metadata(meta: dict) -> dict:
-    """json.dumps chokes on sets, so convert them to sorted lists."""
-    result = {}
-    for key, val in meta.items():
-        if isinstance(val, set):
-            result[key] = sorted(val)
-        else:
-            result[key] = val
-    return result
-
-
-def _serialize_messages(messages: list) -> list:
-    """Same set-to-list cleanup, but for each message dict."""
-    out = []
-    for msg in messages:
-        clean = {}
-        for key, val in msg.items():
-            if isinstance(val, set):
-                clean[key] = sorted(val)
-            else:
-                clean[key] = val
-        out.append(clean)
-    return out
+
+
+def _json_default(obj):
+    """json.dump chokes on sets, so hand them over as sorted lists; anything
+    else unknown becomes its str(). Called only for those values, during the
+    one walk the encoder makes anyway."""
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj)
+    return str(obj)
@@ -1,18 +1,57 @@
 """Reads Claude Code .jsonl session files and turns them into dicts we can
 actually work with -- messages, tool calls, token counts, file activity, etc."""
 
+import functools
 import json
 import os
 from datetime import datetime
 
+from utils import fastjson
+
+
+# Session files are read in big binary blocks and each line goes to the JSON
+# decoder as raw bytes, skipping a UTF-8 decode into a str first.
+_READ_BUFFER = 1 << 20
+
+
+def _decode_line(line: bytes):
+    """Decode one JSONL line, or return None if it's blank or not JSON.
+    A line that isn't valid UTF-8 is retried with replacement characters,
+    which is what reading in text mode with errors="replace" used to give."""
+    if not line.strip():
+        return None
+    try:
+        return fastjson.loads(line)
+    except ValueError:
+        pass
+    try:
+        return fastjson.loads(line.decode("utf-8", errors="replace"))
+    except ValueError:
+        return None
+
 
 def parse_session(filepath: str) -> dict:
     """Main entry point. Reads every line from a .jsonl file and builds up
     a session dict with messages, metadata (tokens, models, tool counts),
     and file/command activity."""
     session_id = os.path.basename(filepath).replace(".jsonl", "")
-    messages = []
-    metadata = {
+    metadata = new_metadata(session_id)
+    messages = list(iter_session_messages(filepath, metadata))
+    finalize_metadata(metadata)
+
+    title = _infer_title(messages)
+
+    return {
+        "session_id": session_id,
+        "title": title,
+        "messages": messages,
+        "metadata": metadata,
+    }
+
+
+def new_metadata(session_id: str) -> dict:
+    """Empty metadata dict for iter_session_messages() to fill in."""
+    return {
         "session_id": session_id,
         "models_used": set(),
         "total_input_tokens": 0,
@@ -52,14 +91,17 @@ def parse_session(filepath: str) -> dict:
         "entry_counts": {},
     }
 
-    with open(filepath, "r", encoding="utf-8", errors="replace") as f:
+
+def iter_session_messages(filepath: str, metadata: dict):
+    """Yield a session's messages one at a time, accumulating into
+    *metadata* (from new_metadata()) as it goes. Once exhausted, call
+    finalize_metadata(). Lets callers that only aggregate avoid holding
+    the whole message list."""
+    batch = []
+    with open(filepath, "rb", buffering=_READ_BUFFER) as f:
         for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                entry = json.loads(line)
-            except json.JSONDecodeError:
+            entry = _decode_line(line)
+            if entry is None:
                 continue
 
             entry_type = entry.get("type")
@@ -86,14 +128,21 @@ def parse_session(filepath: str) -> dict:
                 metadata["sidechain_messages"] += 1
 
             if entry_type == "user":
-                _process_user(entry, messages, metadata)
+                _process_user(entry, batch, metadata)
             elif entry_type == "assistant":
-                _process_assistant(entry, messages, metadata)
+                _process_assistant(entry, batch, metadata)
             elif entry_type == "system":
-                _process_system(entry, messages, metadata)
+                _process_system(entry, batch, metadata)
             elif entry_type == "progress":
-                _process_progress(entry, messages)
+                _process_progress(entry, batch)
 
+            if batch:
+                yield from batch
+                batch.clear()
+
+
+def finalize_metadata(metadata: dict):
+    """Turn the accumulator sets into sorted lists and work out wall time."""
     metadata["models_used"] = sorted(metadata["models_used"])
     metadata["service_tiers"] = sorted(metadata["service_tiers"])
     metadata["files_read"] = sorted(metadata["files_read"])
@@ -115,14 +164,20 @@ def parse_session(filepath: str) -> dict:
         except (ValueError, AttributeError):
             pass
 
-    title = _infer_title(messages)
 
-    return {
-        "session_id": session_id,
-        "title": title,
-        "messages": messages,
-        "metadata": metadata,
-    }
+def parse_session_cached(filepath: str, st: os.stat_result | None = None) -> dict:
+    """parse_session() memoized on the file's (mtime, size). Claude Code only
+    ever appends to session files, so any change bumps the key and the stale
+    entry just ages out of the LRU. The returned dict is shared between
+    callers -- treat it as read-only. Pass *st* if the file was just stat'ed."""
+    if st is None:
+        st = os.stat(filepath)
+    return _parse_session_keyed(filepath, st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_session_keyed(filepath: str, mtime_ns: int, size: int) -> dict:
+    return parse_session(filepath)
 
 
 def _process_user(entry: dict, messages: list, metadata: dict):
@@ -480,18 +535,14 @@ def quick_session_info(filepath: str) -> dict:
     last_ts = None
 
     # --- Pass 1: read first lines to find the title and first_timestamp ---
-    with open(filepath, "r", encoding="utf-8", errors="replace") as f:
+    with open(filepath, "rb") as f:
         lines_read = 0
         for line in f:
             lines_read += 1
             if lines_read > 80:
                 break
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                entry = json.loads(line)
-            except json.JSONDecodeError:
+            entry = _decode_line(line)
+            if entry is None:
                 continue
 
             ts = entry.get("timestamp")
@@ -523,7 +574,7 @@ def quick_session_info(filepath: str) -> dict:
             if not line:
                 continue
             try:
-                entry = json.loads(line)
+                entry = fastjson.loads(line)
             except json.JSONDecodeError:
                 continue
             ts = entry.get("timestamp")
@@ -538,6 +589,51 @@ def quick_session_info(filepath: str) -> dict:
     }
 
 
+def quick_session_info_cached(filepath: str) -> dict:
+    """quick_session_info() memoized the same way as parse_session_cached().
+    The results are tiny, so this cache can afford to be much larger."""
+    st = os.stat(filepath)
+    return _quick_session_info_keyed(filepath, st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=4096)
+def _quick_session_info_keyed(filepath: str, mtime_ns: int, size: int) -> dict:
+    return quick_session_info(filepath)
+
+
+def quick_session_title(filepath: str) -> str:
+    """The title parse_session() would infer, found without building any
+    messages.  Unlike quick_session_info() this keeps reading past the first
+    lines when it has to, so an "Untitled Session" answer is exact and safe
+    to skip a session on."""
+    with open(filepath, "rb", buffering=_READ_BUFFER) as f:
+        for line in f:
+            # Cheap pre-filter: a user entry has to spell out "user" somewhere.
+            if b'"user"' not in line:
+                continue
+            entry = _decode_line(line)
+            if entry is None or entry.get("type") != "user":
+                continue
+            msg = entry.get("message", {})
+            text = _extract_text(msg.get("content", []))
+            if text:
+                first_line = _strip_system_tags(text).strip().split("\n")[0][:100]
+                if first_line:
+                    return first_line
+    return "Untitled Session"
+
+
+def quick_session_title_cached(filepath: str) -> str:
+    """quick_session_title() memoized like quick_session_info_cached()."""
+    st = os.stat(filepath)
+    return _quick_session_title_keyed(filepath, st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=4096)
+def _quick_session_title_keyed(filepath: str, mtime_ns: int, size: int) -> str:
+    return quick_session_title(filepath)
+
+
 def _normalize_content(content) -> list:
     """Content can be a plain string, a list of strings, or a list of typed
     blocks. Normalize everything into [{type, text}, ...] form."""
@@ -3,6 +3,9 @@
 
 from datetime import datetime
 
+from utils.jsonl_parser import _strip_system_tags
+from utils.session_stats import _format_duration
+
 
 def session_to_markdown(session: dict, stats: dict = None) -> str:
     """Glue together frontmatter + header + summary + conversation body."""
@@ -100,7 +103,6 @@ def _build_header(session: dict) -> str:
         parts.append(f"Tool calls: {meta['total_tool_calls']}")
     wall = meta.get("session_wall_time_seconds")
     if wall is not None:
-        from utils.session_stats import _format_duration
         dur = _format_duration(wall)
         if dur:
             parts.append(f"Duration: {dur}")
@@ -206,7 +208,6 @@ def _render_user(msg: dict) -> str:
             lines.append(f'<img src="data:{img["media_type"]};base64,{img["data"]}" alt="User image" style="max-width:100%;max-height:600px">\n')
 
     if msg.get("text"):
-        from utils.jsonl_parser import _strip_system_tags
         lines.append(_strip_system_tags(msg["text"]))
 
     # Render structured tool result instead of raw dump
@@ -251,7 +252,6 @@ def _render_assistant(msg: dict) -> str:
         lines.append("\n</details>\n")
 
     if msg.get("text"):
-        from utils.jsonl_parser import _strip_system_tags
         lines.append(_strip_system_tags(msg["text"]))
 
     if msg.get("tool_uses"):
@@ -0,0 +1,248 @@
+"""Persistent full-text index behind /api/search.
+
+Message text from every session is mirrored into an SQLite FTS5 table
+(~/.claude-code-chat-browser/search.db by default) so a query doesn't have
+to re-parse every .jsonl file. The trigram tokenizer gives case-insensitive
+substring matching, which is what the brute-force search always did.
+
+Before each query the index is refreshed: any session file whose mtime or
+size changed since it was indexed gets its rows replaced, and files that
+disappeared are dropped. The source files under ~/.claude/ are only ever
+read.
+
+Sessions matched by the exclusion rules are never copied in: they are
+recorded without any text or title, and a change of rules wipes the index
+so it is rebuilt under the new ones.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+from utils.exclusion_rules import ExclusionMatcher, iter_searchable_parts
+from utils.jsonl_parser import parse_session_cached
+from utils.session_path import list_projects, list_sessions
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_SEARCH_INDEX_FILENAME = "search.db"
+
+# Trigram tokens need at least three characters to match against.
+_MIN_MATCH_LEN = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    base TEXT NOT NULL,
+    project TEXT NOT NULL,
+    fname TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    first_rowid INTEGER NOT NULL,
+    row_count INTEGER NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS messages USING fts5(
+    text,
+    path UNINDEXED,
+    role UNINDEXED,
+    timestamp UNINDEXED,
+    tokenize = 'trigram'
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def get_default_search_index_path() -> str:
+    """Return the path to the default search index database."""
+    return os.path.join(
+        str(Path.home()), ".claude-code-chat-browser", DEFAULT_SEARCH_INDEX_FILENAME
+    )
+
+
+class SearchIndex:
+    """SQLite FTS5 mirror of session message text.
+
+    Connections are opened per call, so one instance can be shared across
+    request threads; a lock keeps concurrent refreshes from doing the same
+    re-indexing work twice.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._refresh_lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with self._transaction() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        conn = self._connect()
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def refresh(self, base_dir: str, matcher: ExclusionMatcher | None = None) -> int:
+        """Bring the index in line with the session files under *base_dir*.
+
+        Sessions *matcher* excludes are recorded but their text is not
+        stored. Returns the number of files that were (re)indexed.
+        """
+        rules_key = matcher.key if matcher else ""
+        with self._refresh_lock, self._transaction() as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'rules_key'").fetchone()
+            if (row[0] if row else "") != rules_key:
+                # Text kept under the old rules may now be excluded, and files
+                # skipped under them may now be allowed: start over.
+                conn.execute("DELETE FROM messages")
+                conn.execute("DELETE FROM files")
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('rules_key', ?)",
+                    (rules_key,),
+                )
+            indexed = {
+                row[0]: row[1:]
+                for row in conn.execute(
+                    "SELECT path, mtime, size, first_rowid, row_count "
+                    "FROM files WHERE base = ?",
+                    (base_dir,),
+                )
+            }
+            changed = 0
+            for project in list_projects(base_dir):
+                for sess_info in list_sessions(project["path"]):
+                    path = sess_info["path"]
+                    previous = indexed.pop(path, None)
+                    if previous and previous[:2] == (sess_info["modified"], sess_info["size_bytes"]):
+                        continue
+                    if previous:
+                        _delete_rows(conn, *previous[2:])
+                    self._index_file(conn, base_dir, project["name"], sess_info, matcher)
+                    changed += 1
+            for path, previous in indexed.items():
+                _delete_rows(conn, *previous[2:])
+                conn.execute("DELETE FROM files WHERE path = ?", (path,))
+        return changed
+
+    def _index_file(self, conn, base_dir: str, project_name: str, sess_info: dict,
+                    matcher: ExclusionMatcher | None):
+        path = sess_info["path"]
+        # Failed and excluded files are still recorded, with no text, so
+        # they aren't retried until they change.
+        empty = {"session_id": sess_info["id"], "title": "", "messages": []}
+        try:
+            session = parse_session_cached(path)
+        except Exception as e:
+            _logger.warning("Failed to index %s: %s", sess_info["id"][:10], e)
+            session = empty
+        else:
+            if matcher and matcher.matches_chunks(iter_searchable_parts(
+                project_name=project_name,
+                session_title=session["title"],
+                model_names=session["metadata"].get("models_used"),
+                content_parts=(msg.get("text") for msg in session["messages"]),
+            )):
+                session = empty
+
+        # Each file's messages get a contiguous block of explicit rowids, so
+        # re-indexing deletes by rowid range rather than scanning the table.
+        (first_rowid,) = conn.execute(
+            "SELECT COALESCE(MAX(rowid), 0) + 1 FROM messages"
+        ).fetchone()
+        rows = []
+        for msg in session["messages"]:
+            text = msg.get("text", "") or msg.get("content", "")
+            if isinstance(text, str) and text:
+                rows.append((first_rowid + len(rows), text, path, msg["role"], msg.get("timestamp")))
+        conn.executemany(
+            "INSERT INTO messages (rowid, text, path, role, timestamp) VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO files "
+            "(path, base, project, fname, session_id, title, mtime, size, first_rowid, row_count) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                path, base_dir, project_name, os.path.basename(path),
+                session["session_id"], session["title"],
+                sess_info["modified"], sess_info["size_bytes"],
+                first_rowid, len(rows),
+            ),
+        )
+
+    def search(self, base_dir: str, query: str):
+        """Yield candidate hits for lowercase *query* in browse order.
+
+        Each hit is a dict with project, session_id, title, role, timestamp,
+        text and path.  FTS case folding isn't byte-for-byte identical to
+        ``str.lower()``, so callers should confirm the match on ``text``.
+        """
+        select = (
+            "SELECT f.project, f.session_id, f.title, m.role, m.timestamp, m.text, f.path "
+            "FROM messages AS m JOIN files AS f ON f.path = m.path "
+            "WHERE f.base = ? "
+        )
+        order = " ORDER BY f.project, f.fname, m.rowid"
+        if len(query) >= _MIN_MATCH_LEN:
+            phrase = '"' + query.replace('"', '""') + '"'
+            sql, params = select + "AND messages MATCH ?" + order, (base_dir, phrase)
+        else:
+            # Too short for trigrams: scan the stored text instead, which is
+            # still far cheaper than re-parsing every session file.
+            sql, params = select + order, (base_dir,)
+
+        conn = self._connect()
+        try:
+            for project, session_id, title, role, timestamp, text, path in conn.execute(sql, params):
+                yield {
+                    "project": project,
+                    "session_id": session_id,
+                    "title": title,
+                    "role": role,
+                    "timestamp": timestamp,
+                    "text": text,
+                    "path": path,
+                }
+        finally:
+            conn.close()
+
+
+def _delete_rows(conn, first_rowid: int, row_count: int):
+    if row_count:
+        conn.execute(
+            "DELETE FROM messages WHERE rowid >= ? AND rowid < ?",
+            (first_rowid, first_rowid + row_count),
+        )
+
+
+def open_search_index(db_path: str | None) -> SearchIndex | None:
+    """Open (creating if needed) the index at *db_path*.
+
+    Returns None when *db_path* is None or SQLite can't provide an FTS5
+    trigram table, in which case search falls back to scanning files.
+    """
+    if not db_path:
+        return None
+    try:
+        return SearchIndex(db_path)
+    except (sqlite3.Error, OSError) as e:
+        _logger.warning(
+            "Search index unavailable at %s (%s); falling back to a full scan.",
+            db_path,
+            e,
+        )
+        return None
@@ -1,20 +1,79 @@
 """Finds where Claude Code stores its .jsonl session files on disk and
 lists projects/sessions from that directory."""
 
+import functools
+import json
 import os
 import platform
+import stat
+from datetime import datetime, timezone
+
+
+def _dir_stamp(path: str) -> tuple[int, int, int]:
+    """Identity and mtime of the directory at *path*, following symlinks.
+    Retargeting a symlink changes the identity; adding, removing or swapping
+    an entry inside the directory bumps its mtime."""
+    st = os.stat(path)
+    return (st.st_dev, st.st_ino, st.st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=16)
+def _resolve_base_stamped(base: str, stamp: tuple) -> str:
+    return os.path.realpath(base)
+
+
+def _resolve_base(base: str) -> str:
+    """os.path.realpath(*base*), redone only when the directory it points at
+    changes -- one stat instead of an lstat per path component."""
+    try:
+        stamp = _dir_stamp(base)
+    except OSError:
+        return os.path.realpath(base)
+    return _resolve_base_stamped(base, stamp)
 
 
 def safe_join(base: str, *parts: str) -> str:
     """Join path components and verify the result stays under base.
     Raises ValueError if the resolved path escapes the base directory."""
     joined = os.path.realpath(os.path.join(base, *parts))
-    base_resolved = os.path.realpath(base)
+    base_resolved = _resolve_base(base)
     if not joined.startswith(base_resolved + os.sep) and joined != base_resolved:
         raise ValueError(f"Path escapes base directory: {joined}")
     return joined
 
 
+@functools.lru_cache(maxsize=1024)
+def _safe_join_stamped(base: str, parts: tuple, stamps: tuple) -> str:
+    return safe_join(base, *parts)
+
+
+def safe_join_cached(base: str, *parts: str) -> str:
+    """safe_join() memoized for the per-request lookups in the API.
+
+    The cache key carries a stamp of each directory on the way down (base,
+    then every part but the last), so a symlink swapped in anywhere along
+    the path changes the key and the path is resolved and checked again.
+    Rejections aren't cached.
+    """
+    try:
+        stamps = tuple(
+            _dir_stamp(os.path.join(base, *parts[:i])) for i in range(len(parts))
+        )
+    except OSError:
+        return safe_join(base, *parts)
+    return _safe_join_stamped(base, parts, stamps)
+
+
+def stat_file(path: str) -> os.stat_result | None:
+    """os.stat() *path* if it's a regular file, else None. Stands in for an
+    os.path.isfile() check when the caller needs the stat result anyway."""
+    try:
+        st = os.stat(path)
+    except (OSError, ValueError):
+        return None
+    return st if stat.S_ISREG(st.st_mode) else None
+
+
 def get_claude_projects_dir() -> str:
     """~/.claude/projects/ -- handles Windows USERPROFILE vs Unix HOME."""
     system = platform.system()
@@ -25,36 +84,39 @@ def get_claude_projects_dir() -> str:
     return os.path.join(home, ".claude", "projects")
 
 
-def list_projects(base_dir: str | None = None) -> list[dict]:
-    """Scan the projects dir and return info for each one that has .jsonl files."""
+def list_projects(base_dir: str | None = None, name_filter: str | None = None) -> list[dict]:
+    """Scan the projects dir and return info for each one that has .jsonl files.
+    With *name_filter*, only dirs whose name contains it are looked at."""
     base = base_dir or get_claude_projects_dir()
     if not os.path.isdir(base):
         return []
 
+    with os.scandir(base) as it:
+        entries = sorted(
+            (e for e in it if not name_filter or name_filter in e.name),
+            key=lambda e: e.name,
+        )
+
     projects = []
-    for name in sorted(os.listdir(base)):
-        project_dir = os.path.join(base, name)
-        if not os.path.isdir(project_dir):
+    for entry in entries:
+        if not entry.is_dir():
             continue
-        jsonl_files = [
-            f for f in os.listdir(project_dir)
-            if f.endswith(".jsonl") and not f.startswith(".")
-        ]
+        name = entry.name
+        project_dir = entry.path
+        with os.scandir(project_dir) as it:
+            jsonl_files = [
+                f for f in it
+                if f.name.endswith(".jsonl") and not f.name.startswith(".")
+            ]
         if jsonl_files:
-            latest_mtime = max(
-                os.path.getmtime(os.path.join(project_dir, jf))
-                for jf in jsonl_files
-            )
-            from datetime import datetime, timezone
+            latest_mtime = max(f.stat().st_mtime for f in jsonl_files)
             last_modified = datetime.fromtimestamp(
                 latest_mtime, tz=timezone.utc
             ).isoformat()
             # Read cwd from sessions to get the real project path
             display_name = None
             for jf in jsonl_files:
-                display_name = _get_display_name(
-                    os.path.join(project_dir, jf), None
-                )
+                display_name = _get_display_name(jf.path, None)
                 if display_name:
                     break
             if not display_name:
@@ -72,7 +134,6 @@ def list_projects(base_dir: str | None = None) -> list[dict]:
 def _get_display_name(jsonl_path: str, fallback: str) -> str:
     """Peek at the first entry's cwd field to get a human-readable project path
     instead of the hashed directory name."""
-    import json
     try:
         with open(jsonl_path, "r", encoding="utf-8", errors="replace") as f:
             for line in f:
@@ -94,20 +155,23 @@ def _get_display_name(jsonl_path: str, fallback: str) -> str:
 
 def list_sessions(project_dir: str) -> list[dict]:
     """Return id, path, size, mtime for each .jsonl file in a project dir."""
-    sessions = []
-    if not os.path.isdir(project_dir):
-        return sessions
+    # One scandir gives names and paths together; a missing or non-directory
+    # path just means no sessions.
+    try:
+        with os.scandir(project_dir) as it:
+            entries = sorted(
+                (e for e in it if e.name.endswith(".jsonl")), key=lambda e: e.name
+            )
+    except (FileNotFoundError, NotADirectoryError):
+        return []
 
-    for fname in sorted(os.listdir(project_dir)):
-        if not fname.endswith(".jsonl"):
-            continue
-        fpath = os.path.join(project_dir, fname)
-        session_id = fname.replace(".jsonl", "")
-        stat = os.stat(fpath)
+    sessions = []
+    for entry in entries:
+        st = entry.stat()
         sessions.append({
-            "id": session_id,
-            "path": fpath,
-            "size_bytes": stat.st_size,
-            "modified": stat.st_mtime,
+            "id": entry.name.replace(".jsonl", ""),
+            "path": entry.path,
+            "size_bytes": st.st_size,
+            "modified": st.st_mtime,
         })
     return sessions
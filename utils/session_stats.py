@@ -2,6 +2,10 @@
 activity, command success rates, conversation turns, etc. Bridges the raw
 parser output to the exporters."""
 
+import os
+
+from utils.jsonl_parser import finalize_metadata, iter_session_messages, new_metadata
+
 # Approximate pricing per 1M tokens (USD) as of early 2026.
 # Used for best-effort cost estimation only.
 _MODEL_PRICING = {
@@ -15,27 +19,82 @@ _MODEL_PRICING = {
 def compute_stats(session: dict) -> dict:
     """Build the full stats dict for a session. Everything the exporters and
     API endpoints need -- file lists, command history, cost, turn count."""
-    meta = session["metadata"]
-    messages = session["messages"]
+    tally = _tally_messages(session["messages"])
+    return _assemble_stats(session["metadata"], tally)
+
+
+def compute_stats_streaming(filepath: str) -> dict:
+    """Same result as compute_stats(parse_session(filepath)), but folds the
+    messages in as they're read instead of keeping the whole list around."""
+    session_id = os.path.basename(filepath).replace(".jsonl", "")
+    meta = new_metadata(session_id)
+    tally = _tally_messages(iter_session_messages(filepath, meta))
+    finalize_metadata(meta)
+    return _assemble_stats(meta, tally)
 
-    stats = {
+
+def _assemble_stats(meta: dict, tally: dict) -> dict:
+    return {
         "files_touched": _compute_files_touched(meta),
-        "commands_run": _compute_commands_run(messages),
+        "commands_run": tally["commands_run"],
         "urls_accessed": list(meta.get("web_fetches", [])),
-        "conversation_turns": _count_turns(messages),
+        "conversation_turns": tally["conversation_turns"],
         "wall_clock_seconds": meta.get("session_wall_time_seconds"),
         "wall_clock_display": _format_duration(
             meta.get("session_wall_time_seconds")
         ),
-        "cost_estimate_usd": _estimate_cost(messages, meta),
-        "tool_result_summary": _summarize_tool_results(messages),
+        "cost_estimate_usd": tally["cost_estimate_usd"],
+        "tool_result_summary": tally["tool_result_summary"],
         "stop_reason_summary": dict(meta.get("stop_reasons", {})),
         "entry_type_counts": dict(meta.get("entry_counts", {})),
         "sidechain_message_count": meta.get("sidechain_messages", 0),
         "api_error_count": meta.get("api_errors", 0),
         "compaction_events": meta.get("compact_boundaries", []),
     }
-    return stats
+
+
+def _tally_messages(messages) -> dict:
+    """One pass over *messages* (any iterable) for everything the stats need
+    from them: matched Bash commands, turn count, cost, tool result counts."""
+    commands = []
+    # tool_use_id -> command, waiting for its result
+    pending_commands = {}
+    turns = 0
+    prev_role = None
+    cost_total = 0.0
+    has_cost = False
+    summary = dict.fromkeys(_TOOL_RESULT_KEYS, 0)
+
+    for msg in messages:
+        role = msg["role"]
+        _match_command(msg, pending_commands, commands)
+
+        if role == "assistant" and prev_role == "user":
+            turns += 1
+        if role in ("user", "assistant"):
+            prev_role = role
+
+        if role == "assistant":
+            cost = _message_cost(msg)
+            if cost:
+                has_cost = True
+                cost_total += cost[0]
+                cost_total += cost[1]
+        elif role == "user":
+            _count_tool_result(msg, summary)
+
+    # Add any unmatched commands (no result captured)
+    for entry in pending_commands.values():
+        entry["exit_code"] = None
+        entry["is_error"] = None
+        commands.append(entry)
+
+    return {
+        "commands_run": commands,
+        "conversation_turns": turns,
+        "cost_estimate_usd": round(cost_total, 4) if has_cost else None,
+        "tool_result_summary": summary,
+    }
 
 
 def _compute_files_touched(meta: dict) -> dict:
@@ -53,84 +112,56 @@ def _compute_files_touched(meta: dict) -> dict:
     }
 
 
-def _compute_commands_run(messages: list) -> list:
-    """Walk through messages and match up Bash tool_use calls with their
-    subsequent tool_result entries to get exit codes and error status."""
-    commands = []
-    # Build a map of tool_use_id -> command from assistant messages
-    pending_commands = {}
-    for msg in messages:
-        if msg["role"] == "assistant" and msg.get("tool_uses"):
-            for tu in msg["tool_uses"]:
-                if tu["name"] == "Bash":
-                    cmd = tu["input"].get("command", "")
-                    if cmd:
-                        pending_commands[tu["id"]] = {
-                            "command": cmd,
-                            "timestamp": msg.get("timestamp"),
-                        }
-
-        # Match tool results back to commands
-        if msg["role"] == "user" and msg.get("tool_result_parsed"):
-            trp = msg["tool_result_parsed"]
-            if trp.get("result_type") == "bash":
-                # Try to find matching command by sequential order
-                if pending_commands:
-                    first_id = next(iter(pending_commands))
-                    entry = pending_commands.pop(first_id)
-                    entry["exit_code"] = trp.get("exit_code")
-                    entry["is_error"] = trp.get("is_error", False)
-                    entry["interrupted"] = trp.get("interrupted", False)
-                    entry["return_code_interpretation"] = trp.get(
-                        "return_code_interpretation"
-                    )
-                    commands.append(entry)
-
-    # Add any unmatched commands (no result captured)
-    for entry in pending_commands.values():
-        entry["exit_code"] = None
-        entry["is_error"] = None
-        commands.append(entry)
-
-    return commands
-
-
-def _count_turns(messages: list) -> int:
-    """Count how many times the user said something and got a reply back."""
-    turns = 0
-    prev_role = None
-    for msg in messages:
-        role = msg["role"]
-        if role == "assistant" and prev_role == "user":
-            turns += 1
-        if role in ("user", "assistant"):
-            prev_role = role
-    return turns
+def _match_command(msg: dict, pending_commands: dict, commands: list):
+    """Match up Bash tool_use calls with their subsequent tool_result entries
+    to get exit codes and error status."""
+    if msg["role"] == "assistant" and msg.get("tool_uses"):
+        for tu in msg["tool_uses"]:
+            if tu["name"] == "Bash":
+                cmd = tu["input"].get("command", "")
+                if cmd:
+                    pending_commands[tu["id"]] = {
+                        "command": cmd,
+                        "timestamp": msg.get("timestamp"),
+                    }
+
+    # Match tool results back to commands
+    if msg["role"] == "user" and msg.get("tool_result_parsed"):
+        trp = msg["tool_result_parsed"]
+        if trp.get("result_type") == "bash":
+            # Try to find matching command by sequential order
+            if pending_commands:
+                first_id = next(iter(pending_commands))
+                entry = pending_commands.pop(first_id)
+                entry["exit_code"] = trp.get("exit_code")
+                entry["is_error"] = trp.get("is_error", False)
+                entry["interrupted"] = trp.get("interrupted", False)
+                entry["return_code_interpretation"] = trp.get(
+                    "return_code_interpretation"
+                )
+                commands.append(entry)
 
 
 def _estimate_cost(messages: list, meta: dict) -> float | None:
     """Rough cost estimate based on each message's token count and the model
     that generated it. Not exact -- doesn't account for caching discounts."""
-    total = 0.0
-    has_data = False
+    return _tally_messages(messages)["cost_estimate_usd"]
 
-    for msg in messages:
-        if msg["role"] != "assistant":
-            continue
-        model = msg.get("model", "")
-        usage = msg.get("usage", {})
-        inp = usage.get("input_tokens") or 0
-        out = usage.get("output_tokens") or 0
-        if not (inp or out):
-            continue
 
-        pricing = _get_pricing(model)
-        if pricing:
-            has_data = True
-            total += (inp / 1_000_000) * pricing[0]
-            total += (out / 1_000_000) * pricing[1]
+def _message_cost(msg: dict) -> tuple | None:
+    """(input_cost, output_cost) for one assistant message, or None when it
+    has no tokens or an unknown model."""
+    model = msg.get("model", "")
+    usage = msg.get("usage", {})
+    inp = usage.get("input_tokens") or 0
+    out = usage.get("output_tokens") or 0
+    if not (inp or out):
+        return None
 
-    return round(total, 4) if has_data else None
+    pricing = _get_pricing(model)
+    if not pricing:
+        return None
+    return (inp / 1_000_000) * pricing[0], (out / 1_000_000) * pricing[1]
 
 
 def _get_pricing(model: str) -> tuple | None:
@@ -143,53 +174,49 @@ def _get_pricing(model: str) -> tuple | None:
     return None
 
 
-def _summarize_tool_results(messages: list) -> dict:
-    """Count up how many tool results succeeded, failed, or got interrupted,
-    broken down by tool type."""
-    summary = {
-        "bash_success": 0,
-        "bash_error": 0,
-        "bash_interrupted": 0,
-        "file_reads": 0,
-        "file_edits": 0,
-        "file_writes": 0,
-        "glob_searches": 0,
-        "grep_searches": 0,
-        "web_fetches": 0,
-        "web_searches": 0,
-        "tasks": 0,
-    }
-    for msg in messages:
-        if msg["role"] != "user":
-            continue
-        trp = msg.get("tool_result_parsed")
-        if not trp:
-            continue
-        rt = trp.get("result_type", "")
-        if rt == "bash":
-            if trp.get("interrupted"):
-                summary["bash_interrupted"] += 1
-            elif trp.get("is_error"):
-                summary["bash_error"] += 1
-            else:
-                summary["bash_success"] += 1
-        elif rt == "file_read":
-            summary["file_reads"] += 1
-        elif rt == "file_edit":
-            summary["file_edits"] += 1
-        elif rt == "file_write":
-            summary["file_writes"] += 1
-        elif rt == "glob":
-            summary["glob_searches"] += 1
-        elif rt == "grep":
-            summary["grep_searches"] += 1
-        elif rt == "web_fetch":
-            summary["web_fetches"] += 1
-        elif rt == "web_search":
-            summary["web_searches"] += 1
-        elif rt == "task":
-            summary["tasks"] += 1
-    return summary
+_TOOL_RESULT_KEYS = (
+    "bash_success",
+    "bash_error",
+    "bash_interrupted",
+    "file_reads",
+    "file_edits",
+    "file_writes",
+    "glob_searches",
+    "grep_searches",
+    "web_fetches",
+    "web_searches",
+    "tasks",
+)
+
+# result_type -> summary key, for the types that are a plain count
+_TOOL_RESULT_COUNTERS = {
+    "file_read": "file_reads",
+    "file_edit": "file_edits",
+    "file_write": "file_writes",
+    "glob": "glob_searches",
+    "grep": "grep_searches",
+    "web_fetch": "web_fetches",
+    "web_search": "web_searches",
+    "task": "tasks",
+}
+
+
+def _count_tool_result(msg: dict, summary: dict):
+    """Count a user message's tool result as succeeded, failed, or
+    interrupted, broken down by tool type."""
+    trp = msg.get("tool_result_parsed")
+    if not trp:
+        return
+    rt = trp.get("result_type", "")
+    if rt == "bash":
+        if trp.get("interrupted"):
+            summary["bash_interrupted"] += 1
+        elif trp.get("is_error"):
+            summary["bash_error"] += 1
+        else:
+            summary["bash_success"] += 1
+    elif rt in _TOOL_RESULT_COUNTERS:
+        summary[_TOOL_RESULT_COUNTERS[rt]] += 1
 
 
 def _format_duration(seconds) -> str | None: